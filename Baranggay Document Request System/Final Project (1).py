@@ -1,69 +1,372 @@
 # IMPORTS AND SETUP
+import gzip
 import json
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from colorama import init, Fore
 
+try:
+    import fcntl  # file locks on Linux/macOS
+except ImportError:
+    fcntl = None
+    import msvcrt  # file locks on Windows
+
 init(autoreset=True)  # for colored outputs
 
 # DATA HANDLING
-ARCHIVE_FILE = "barangay_archived.json"
+ARCHIVE_FILE = "barangay_archived.json"  # old single-file archive, moved into ARCHIVE_DIR on start
+ARCHIVE_DIR = "barangay_archive"          # one YYYY-MM.json.gz segment per archived month
+MANIFEST_FILE = os.path.join(ARCHIVE_DIR, "manifest.json")
+SEQUENCE_FILE = "barangay_sequence.json"  # last transaction number handed out today
+
+@contextmanager
+def file_lock(file_name):
+    """Hold an exclusive lock on <file_name>.lock so other terminals wait for us."""
+    with open(file_name + ".lock", "a+") as lock:
+        if fcntl:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        else:
+            lock.seek(0)  # msvcrt locks bytes from the current position
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
 
 def load_data(file_name):
     """Load data from JSON file or create a new one if it doesn't exist."""
     if not os.path.exists(file_name):
-        with open(file_name, "w") as f:
-            json.dump({"transactions": []}, f, indent=4)
+        try:
+            with open(file_name, "x") as f:  # "x": never truncate a file another terminal just created
+                json.dump({"transactions": []}, f, indent=4)
+        except FileExistsError:
+            pass
     with open(file_name, "r") as f:
         return json.load(f)
 
 def save_data(data, file_name):
-    """Save updated data to JSON file."""
-    with open(file_name, "w") as f:
+    """Save updated data to JSON file (through a temp file, so readers never see half of it)."""
+    with open(file_name + ".tmp", "w") as f:
         json.dump(data, f, indent=4)
+    os.replace(file_name + ".tmp", file_name)
 
 def get_current_month_file():
     """Return JSON filename for current month."""
     month_str = datetime.now().strftime("%Y-%m")
     return f"barangay_data_{month_str}.json"
 
-def load_archive():
-    """Load archived transactions from archive file."""
-    if not os.path.exists(ARCHIVE_FILE):
-        with open(ARCHIVE_FILE, "w") as f:
-            json.dump({"archived": []}, f, indent=4)
+# TRANSACTION INDEX
+class TransactionIndex:
+    """
+    Lookups into one month's transactions by number, date created and status,
+    plus the dashboard counters (kept up to date instead of recounted).
+    """
+
+    def __init__(self, transactions):
+        self.by_number = {}  # transaction number -> transaction
+        self.by_date = {}    # "YYYY-MM-DD" -> [transactions]
+        self.by_status = {}  # status -> {id(transaction): transaction}, in insertion order
+        self.total = 0
+        self.document_counts = {}  # document type -> documents requested
+        self.fees_collected = 0    # total fees of completed transactions
+        for t in transactions:
+            self.add(t)
+
+    def add(self, transaction):
+        self.by_number.setdefault(transaction["transaction_number"], transaction)
+        self.by_date.setdefault(transaction["date_created"], []).append(transaction)
+        self.by_status.setdefault(transaction["status"], {})[id(transaction)] = transaction
+        self.count(transaction)
+
+    def count(self, transaction):
+        """Add a transaction to the dashboard counters."""
+        self.total += 1
+        for doc in transaction["documents"]:
+            self.document_counts[doc["type"]] = self.document_counts.get(doc["type"], 0) + 1
+        if transaction["status"] == "Completed":
+            self.fees_collected += transaction["total_fee"]
+
+    def uncount(self, transaction):
+        """Take a transaction out of the dashboard counters (before its documents or status change)."""
+        self.total -= 1
+        for doc in transaction["documents"]:
+            self.document_counts[doc["type"]] -= 1
+            if not self.document_counts[doc["type"]]:
+                del self.document_counts[doc["type"]]
+        if transaction["status"] == "Completed":
+            self.fees_collected -= transaction["total_fee"]
+
+    def set_status(self, transaction, status):
+        """Change a transaction's status and move it to the new status set."""
+        self.uncount(transaction)
+        self.by_status.get(transaction["status"], {}).pop(id(transaction), None)
+        transaction["status"] = status
+        self.by_status.setdefault(status, {})[id(transaction)] = transaction
+        self.count(transaction)
+
+    def status_count(self, status):
+        return len(self.by_status.get(status, {}))
+
+    def find_number(self, transaction_number):
+        return self.by_number.get(transaction_number)
+
+    def find_date(self, date_str):
+        return self.by_date.get(date_str, [])
+
+    def find_status(self, status):
+        return list(self.by_status.get(status, {}).values())
+
+_loaded = {}  # file name -> (signature, data, index) as of our last load/save
+
+def file_signature(file_name):
+    """Changes whenever the file is rewritten (by us or another terminal)."""
+    return stat_signature(os.stat(file_name))
+
+def stat_signature(st):
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+def read_indexed(file_name):
+    """
+    Read the file from disk (never from the cache) and index it. Use it under
+    file_lock(file_name) before changing and saving the data.
+    """
+    if not os.path.exists(file_name):
+        load_data(file_name)  # creates the empty month file
+    with open(file_name, "r") as f:
+        # signature of the file we actually read: saves replace the file, they never edit it
+        signature = stat_signature(os.fstat(f.fileno()))
+        data = json.load(f)
+    index = TransactionIndex(data["transactions"])
+    _loaded[file_name] = (signature, data, index)
+    return data, index
+
+def load_indexed(file_name):
+    """Load data and its TransactionIndex; reused as long as the file hasn't changed on disk."""
+    cached = _loaded.get(file_name)
+    if cached and os.path.exists(file_name) and cached[0] == file_signature(file_name):
+        return cached[1], cached[2]
+    return read_indexed(file_name)
+
+def save_indexed(data, file_name):
+    """
+    Save data from read_indexed (its index was updated by the caller). Hold
+    file_lock(file_name) from that read through this save, so changes other
+    terminals saved in between aren't overwritten.
+    """
+    save_data(data, file_name)
+    _loaded[file_name] = (file_signature(file_name), data, _loaded[file_name][2])
+
+def load_manifest():
+    """Archived months: {"YYYY-MM": {"file": segment name, "count": transactions}}."""
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            return json.load(f)["months"]
+    except FileNotFoundError:
+        return {}
+
+def save_manifest(months):
+    with open(MANIFEST_FILE + ".tmp", "w") as f:
+        json.dump({"months": months}, f, indent=4, sort_keys=True)
+    os.replace(MANIFEST_FILE + ".tmp", MANIFEST_FILE)
+
+def segment_path(month):
+    return os.path.join(ARCHIVE_DIR, f"{month}.json.gz")
+
+def read_archive_month(month):
+    """Archived transactions of one month (only that month's segment is decompressed)."""
+    try:
+        with gzip.open(segment_path(month), "rt", encoding="utf-8") as f:
+            return json.load(f)["transactions"]
+    except FileNotFoundError:
+        return []
+
+def archive_month(month, transactions, months):
+    """
+    Write a month's transactions as its segment and list it in the manifest.
+    If the month was already (partly) archived, the segment is rewritten with
+    the new transactions added; ones already in it are skipped, so archiving
+    the same file again after an interruption doesn't duplicate anything.
+    """
+    if month in months:
+        archived = read_archive_month(month)
+        numbers = {t["transaction_number"] for t in archived}
+        transactions = archived + [t for t in transactions if t["transaction_number"] not in numbers]
+    path = segment_path(month)
+    with gzip.open(path + ".tmp", "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump({"transactions": transactions}, f)
+    os.replace(path + ".tmp", path)
+    months[month] = {"file": os.path.basename(path), "count": len(transactions)}
+    save_manifest(months)
+
+def migrate_archive_file(months):
+    """Split the old barangay_archived.json into month segments (kept as .migrated afterwards)."""
     with open(ARCHIVE_FILE, "r") as f:
-        return json.load(f)
-
-def save_archive(archive):
-    """Save archived transactions."""
-    with open(ARCHIVE_FILE, "w") as f:
-        json.dump(archive, f, indent=4)
+        archived = json.load(f).get("archived", [])
+    by_month = {}
+    for t in archived:
+        by_month.setdefault(t["date_created"][:7], []).append(t)
+    for month, transactions in sorted(by_month.items()):
+        archive_month(month, transactions, months)
+    os.replace(ARCHIVE_FILE, ARCHIVE_FILE + ".migrated")
+    print(Fore.GREEN + f"Moved {len(archived)} archived transactions into {ARCHIVE_DIR}/ ({len(by_month)} months).")
 
 # ARCHIVE PREVIOUS MONTH TRANSACTIONS AUTOMATICALLY
 def auto_archive_previous_month():
-    archive = load_archive()
     current_month = datetime.now().strftime("%Y-%m")
-
-    for file in os.listdir():
-        if file.startswith("barangay_data_") and file.endswith(".json") and current_month not in file:
-            data = load_data(file)
-            if "transactions" in data and data["transactions"]:
-                archive["archived"].extend(data["transactions"])
-                save_archive(archive)
-                print(Fore.GREEN + f"Archived transactions from {file}.")
-            os.remove(file)  # remove old month file after archiving
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with file_lock(MANIFEST_FILE):  # another terminal starting now waits, then finds nothing left to do
+        months = load_manifest()
+        if os.path.exists(ARCHIVE_FILE):
+            migrate_archive_file(months)
+        for file in sorted(os.listdir()):
+            if file.startswith("barangay_data_") and file.endswith(".json") and current_month not in file:
+                data = load_data(file)
+                if "transactions" in data and data["transactions"]:
+                    month = file[len("barangay_data_"):-len(".json")]
+                    archive_month(month, data["transactions"], months)  # one segment write per month
+                    print(Fore.GREEN + f"Archived transactions from {file}.")
+                os.remove(file)  # remove old month file after archiving
+
+# SEARCH CATALOG
+INDEX_FILE = "barangay_index.json"  # searchable summary of the archive, rebuilt per changed segment
+INDEX_FORMAT = 1
+# one row per transaction: [number, date created, status, total fee, names, [document types]]
+
+def index_row(transaction):
+    """Catalog row of a transaction (everything search filters on or shows)."""
+    names = []
+    for doc in transaction["documents"]:
+        name = f"{doc.get('First Name', '')} {doc.get('Last Name', '')}".strip()
+        if name and name not in names:
+            names.append(name)
+    types = sorted({doc["type"] for doc in transaction["documents"]})
+    return [transaction["transaction_number"], transaction["date_created"], transaction["status"],
+            transaction["total_fee"], "; ".join(names), types]
+
+def archive_sources():
+    """Archive segments covered by the catalog."""
+    return [segment_path(month) for month in sorted(load_manifest())]
+
+def read_archive_source(source):
+    """Transactions stored in one archive segment."""
+    return read_archive_month(os.path.basename(source)[:-len(".json.gz")])
+
+def live_sources():
+    """Monthly data files that haven't been archived yet."""
+    return sorted(f for f in os.listdir() if f.startswith("barangay_data_") and f.endswith(".json"))
+
+_catalog = {}  # archive segment -> {"signature", "first", "last", "rows"} (in-memory copy of INDEX_FILE)
+
+def load_catalog():
+    """
+    The archive's catalog rows by segment. Only segments that changed
+    since the catalog was last written are read again; the catalog is saved
+    back to INDEX_FILE so the next start doesn't read them either.
+    """
+    global _catalog
+    if not _catalog:
+        try:
+            with open(INDEX_FILE, "r") as f:
+                stored = json.load(f)
+        except (FileNotFoundError, ValueError):
+            stored = {}
+        _catalog = stored.get("sources", {}) if stored.get("format") == INDEX_FORMAT else {}
+
+    changed = False
+    sources = archive_sources()
+    for source in sources:
+        signature = list(file_signature(source))
+        entry = _catalog.get(source)
+        if entry is None or entry["signature"] != signature:
+            rows = [index_row(t) for t in read_archive_source(source)]
+            dates = [row[1] for row in rows]
+            _catalog[source] = {"signature": signature, "first": min(dates, default=""),
+                                "last": max(dates, default=""), "rows": rows}
+            changed = True
+    for source in [s for s in _catalog if s not in sources]:
+        del _catalog[source]
+        changed = True
+
+    if changed:
+        tmp = f"{INDEX_FILE}.{os.getpid()}.tmp"  # another terminal may be refreshing it too
+        with open(tmp, "w") as f:
+            json.dump({"format": INDEX_FORMAT, "sources": _catalog}, f)
+        os.replace(tmp, INDEX_FILE)
+    return _catalog
+
+def search_transactions(number="", name="", doc_type="", status="", date_from="", date_to=""):
+    """
+    [(where, row)] for live and archived transactions matching every filter
+    given (blank filters match everything), oldest first. `name` matches
+    any part of a requester's name, ignoring case.
+    """
+    name = name.lower()
+    date_to = date_to or "9999-99-99"
+
+    def matches(row):
+        return ((not number or row[0] == number) and date_from <= row[1] <= date_to
+                and (not status or row[2] == status) and (not name or name in row[4].lower())
+                and (not doc_type or doc_type in row[5]))
+
+    results = []
+    for source, entry in load_catalog().items():
+        if entry["last"] < date_from or entry["first"] > date_to:
+            continue  # segment holds nothing in the date range
+        results.extend((source, row) for row in entry["rows"] if matches(row))
+    for source in live_sources():
+        data, index = load_indexed(source)
+        if number:
+            found = index.find_number(number)
+            candidates = [found] if found else []
+        elif status:
+            candidates = index.find_status(status)
+        else:
+            candidates = data["transactions"]
+        results.extend((source, row) for row in map(index_row, candidates) if matches(row))
+    results.sort(key=lambda result: result[1][1])
+    return results
 
 # TRANSACTION NUMBER
+def sequence_of(transaction_number, today_str):
+    """Sequence part of a number issued on today_str (MMDDYY), or 0 if it's from another day."""
+    if transaction_number.startswith(today_str) and transaction_number[6:].isdigit():
+        return int(transaction_number[6:])
+    return 0
+
 def generate_transaction_number(data):
-    """Generate unique transaction number based on today's date MMDDYY and increment."""
+    """
+    Next transaction number for today: MMDDYY + a daily sequence of at least two
+    digits (MMDDYY01 .. MMDDYY99 like before, then MMDDYY100, MMDDYY101, ...).
+    The sequence is kept in SEQUENCE_FILE under a file lock, so terminals
+    running at the same time never hand out the same number.
+    """
     today_str = datetime.now().strftime("%m%d%y")
-    existing_numbers = [t['transaction_number'] for t in data['transactions'] if t['transaction_number'].startswith(today_str)]
-    for i in range(1, 100):
-        num = f"{today_str}{i:02d}"
-        if num not in existing_numbers:
-            return num
-    raise ValueError("Maximum number of transactions for today reached.")
+    with file_lock(SEQUENCE_FILE):
+        try:
+            with open(SEQUENCE_FILE, "r") as f:
+                sequence = json.load(f)
+        except (FileNotFoundError, ValueError):
+            sequence = {}
+        if sequence.get("day") == today_str:
+            last = sequence["last"]
+        else:
+            # first number today (or no counter yet): continue after today's saved numbers
+            last = max((sequence_of(t["transaction_number"], today_str) for t in data["transactions"]), default=0)
+        sequence = {"day": today_str, "last": last + 1}
+        with open(SEQUENCE_FILE + ".tmp", "w") as f:
+            json.dump(sequence, f)
+        os.replace(SEQUENCE_FILE + ".tmp", SEQUENCE_FILE)
+    return f"{today_str}{sequence['last']:02d}"
 
 # CALCULATE FEE
 def calculate_fee(document_type):
@@ -77,16 +380,17 @@ def calculate_fee(document_type):
 
 # DASHBOARD
 def show_dashboard():
-    data = load_data(get_current_month_file())
-    total = len(data["transactions"])
-    pending = sum(1 for t in data["transactions"] if t["status"] == "Pending")
-    completed = sum(1 for t in data["transactions"] if t["status"] == "Completed")
+    # counters are kept by the index; the month is only recounted if another terminal saved it
+    data, index = load_indexed(get_current_month_file())
     print(Fore.BLUE + "\n===================================================")
     print("Welcome to Barangay San Pascual Document Request Dashboard.")
     print("===================================================")
-    print(f"Total Requests Submitted: {total}")
-    print(f"Pending Requests: {pending}")
-    print(f"Completed Requests: {completed}")
+    print(f"Total Requests Submitted: {index.total}")
+    print(f"Pending Requests: {index.status_count('Pending')}")
+    print(f"Completed Requests: {index.status_count('Completed')}")
+    for document_type, count in sorted(index.document_counts.items()):
+        print(f"  {document_type}: {count}")
+    print(f"Fees Collected: ₱{index.fees_collected}")
     print("===================================================\n")
 
 # ADDRESS INPUT
@@ -109,8 +413,6 @@ def input_address():
 # NEW TRANSACTION
 def new_transaction():
     data_file = get_current_month_file()
-    data = load_data(data_file)
-    transaction_number = generate_transaction_number(data)
     documents = []
 
     while True:
@@ -160,22 +462,25 @@ def new_transaction():
             break
 
     total_fee = sum(d["Fee"] for d in documents)
-    transaction = {
-        "transaction_number": transaction_number,
-        "documents": documents,
-        "total_fee": total_fee,
-        "status": "Pending",
-        "date_created": datetime.now().strftime("%Y-%m-%d")
-    }
-
-    data["transactions"].append(transaction)
-    save_data(data, data_file)
+    with file_lock(data_file):
+        data, index = read_indexed(data_file)  # picks up what other terminals saved meanwhile
+        transaction_number = generate_transaction_number(data)  # numbered once it's actually saved
+        transaction = {
+            "transaction_number": transaction_number,
+            "documents": documents,
+            "total_fee": total_fee,
+            "status": "Pending",
+            "date_created": datetime.now().strftime("%Y-%m-%d")
+        }
+        data["transactions"].append(transaction)
+        index.add(transaction)
+        save_indexed(data, data_file)
     print(Fore.GREEN + f"\nTransaction #{transaction_number} recorded! Total Fee: ₱{total_fee}")
 
 # VIEW TRANSACTIONS
 def view_transactions():
     data_file = get_current_month_file()
-    data = load_data(data_file)
+    data, index = load_indexed(data_file)
     if not data["transactions"]:
         print(Fore.YELLOW + "No transactions available.")
         return
@@ -184,7 +489,7 @@ def view_transactions():
     month = datetime.now().strftime("%Y-%m")
     filtered = []
     if choice == "D":
-        filtered = [t for t in data["transactions"] if t["date_created"] == today]
+        filtered = index.find_date(today)
         print(Fore.CYAN + f"\n--- Transactions Today ({today}) ---")
     else:
         filtered = [t for t in data["transactions"] if t["date_created"].startswith(month)]
@@ -200,8 +505,8 @@ def view_transactions():
 # SEARCH / UPDATE / MARK COMPLETE
 def manage_transaction():
     data_file = get_current_month_file()
-    data = load_data(data_file)
     while True:
+        data, index = load_indexed(data_file)  # reloads only if the file changed
         print("\nSearch Transaction by:")
         print("1. Transaction Number")
         print("2. Status")
@@ -213,14 +518,15 @@ def manage_transaction():
             return
         elif choice == "1":
             txn_num = input("Enter Transaction Number: ").strip()
-            filtered = [t for t in data["transactions"] if t["transaction_number"] == txn_num]
+            found = index.find_number(txn_num)
+            filtered = [found] if found else []
         elif choice == "2":
             print("Statuses: Pending, Completed")
             status = input("Enter Status: ").capitalize()
-            filtered = [t for t in data["transactions"] if t["status"] == status]
+            filtered = index.find_status(status)
         elif choice == "3":
             date_str = input("Enter Date (YYYY-MM-DD): ").strip()
-            filtered = [t for t in data["transactions"] if t["date_created"] == date_str]
+            filtered = index.find_date(date_str)
         else:
             print(Fore.RED + "Invalid choice.")
             continue
@@ -243,7 +549,7 @@ def manage_transaction():
             txn_num = input("Enter Transaction Number to manage (or 'B' to go back): ").strip()
             if txn_num.upper() == 'B':
                 return
-            transaction = next((t for t in data["transactions"] if t["transaction_number"] == txn_num), None)
+            transaction = index.find_number(txn_num)
             if not transaction:
                 print(Fore.RED + "Transaction not found.")
                 continue
@@ -265,7 +571,8 @@ def manage_transaction():
             if not doc_choice.isdigit() or int(doc_choice) not in range(1, len(transaction["documents"]) + 1):
                 print(Fore.RED + "Invalid selection.")
                 continue
-            doc = transaction["documents"][int(doc_choice) - 1]
+            doc_index = int(doc_choice) - 1
+            doc = transaction["documents"][doc_index]
             # Change document type
             print("Select new document type:")
             doc_types = ["Certificate of Indigency", "Cedula", "Barangay Clearance", "Certificate of Good Conduct"]
@@ -274,24 +581,73 @@ def manage_transaction():
             new_type_choice = input("Choice (or 'B' to go back): ")
             if new_type_choice.upper() == 'B':
                 continue
+            changes = {}
             if new_type_choice.isdigit() and 1 <= int(new_type_choice) <= 4:
-                doc["type"] = doc_types[int(new_type_choice) - 1]
-                doc["Fee"] = calculate_fee(doc["type"])
+                changes["type"] = doc_types[int(new_type_choice) - 1]
+                changes["Fee"] = calculate_fee(changes["type"])
             for field in doc.keys():
                 if field not in ["type", "Fee"]:
                     new_val = input(f"Enter new {field} (leave blank to keep '{doc[field]}'): ")
                     if new_val.strip():
-                        doc[field] = new_val
-            transaction["total_fee"] = sum(d["Fee"] for d in transaction["documents"])
-            save_data(data, data_file)
+                        changes[field] = new_val
+            # apply the changes to the latest saved copy, not the one read before the prompts
+            with file_lock(data_file):
+                data, index = read_indexed(data_file)
+                transaction = index.find_number(transaction["transaction_number"])
+                if not transaction or doc_index >= len(transaction["documents"]):
+                    print(Fore.RED + "Transaction not found.")
+                    continue
+                index.uncount(transaction)  # document type and fees may change
+                transaction["documents"][doc_index].update(changes)
+                transaction["total_fee"] = sum(d["Fee"] for d in transaction["documents"])
+                index.count(transaction)
+                save_indexed(data, data_file)  # number, date and status are unchanged
             print(Fore.GREEN + "Transaction updated successfully.")
         elif action == "2":
-            transaction["status"] = "Completed"
-            save_data(data, data_file)
+            with file_lock(data_file):
+                data, index = read_indexed(data_file)
+                transaction = index.find_number(transaction["transaction_number"])
+                if not transaction:
+                    print(Fore.RED + "Transaction not found.")
+                    continue
+                index.set_status(transaction, "Completed")
+                save_indexed(data, data_file)
             print(Fore.GREEN + "Transaction marked as completed successfully.")
         else:
             print(Fore.RED + "Invalid action.")
 
+# SEARCH ALL MONTHS
+def search_all_months():
+    print(Fore.CYAN + "\nSearch this month and the archive (leave a filter blank to skip it)")
+    number = input("Transaction Number: ").strip()
+    name = input("Name (first, last or both): ").strip()
+    doc_types = ["Certificate of Indigency", "Cedula", "Barangay Clearance", "Certificate of Good Conduct"]
+    for i, d in enumerate(doc_types, 1):
+        print(f"{i}. {d}")
+    type_choice = input("Document type (1-4): ").strip()
+    doc_type = doc_types[int(type_choice) - 1] if type_choice in ("1", "2", "3", "4") else ""
+    status = input("Status (Pending/Completed): ").strip().capitalize()
+    date_from = input("From date (YYYY-MM-DD): ").strip()
+    date_to = input("To date (YYYY-MM-DD): ").strip()
+    for date_str in (date_from, date_to):
+        if date_str:
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError:
+                print(Fore.RED + "Invalid date format. Please use YYYY-MM-DD.")
+                return
+
+    results = search_transactions(number, name, doc_type, status, date_from, date_to)
+    if not results:
+        print(Fore.YELLOW + "No matching transactions found.")
+        return
+    for source, (txn_num, date_created, txn_status, total_fee, names, types) in results:
+        print(Fore.MAGENTA + f"\nTransaction #: {txn_num} | Date: {date_created} | Status: {txn_status} | Total Fee: ₱{total_fee}")
+        print(f"  Name: {names}")
+        print(f"  Documents: {', '.join(types)}")
+        print(f"  Found in: {source}")
+    print(Fore.GREEN + f"\n{len(results)} transaction(s) found.")
+
 # MAIN MENU
 def main():
     auto_archive_previous_month()  # Automatically archive old transactions at program start
@@ -301,7 +657,8 @@ def main():
         print("1. New Transaction")
         print("2. View Transactions (Daily/Monthly)")
         print("3. Search / Manage Transaction")
-        print("4. Exit")
+        print("4. Search All Months (incl. archive)")
+        print("5. Exit")
 
         choice = input("Enter your choice: ").strip()
         if choice == "1":
@@ -311,6 +668,8 @@ def main():
         elif choice == "3":
             manage_transaction()
         elif choice == "4":
+            search_all_months()
+        elif choice == "5":
             print(Fore.BLUE + "\nThank you for using Barangay San Pascual Document Request System.")
             break
         else:
@@ -0,0 +1,81 @@
+# test_concurrent_saves.py
+# Regression tests: two terminals saving the same month must not drop each
+# other's transactions.
+import builtins
+import importlib.util
+import json
+import os
+
+import pytest
+
+pytest.importorskip("colorama")
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Final Project (1).py")
+
+
+def load_app():
+    """A fresh copy of the app module, like one more terminal running it."""
+    spec = importlib.util.spec_from_file_location("barangay_app", APP_FILE)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+
+def other_terminal_saves(app, number):
+    """Another terminal appends a transaction to this month's file."""
+    other = load_app()
+    file_name = other.get_current_month_file()
+    with other.file_lock(file_name):
+        data, index = other.read_indexed(file_name)
+        transaction = {"transaction_number": number, "documents": [{"type": "Cedula", "Fee": 50}],
+                       "total_fee": 50, "status": "Pending", "date_created": "2026-10-17"}
+        data["transactions"].append(transaction)
+        index.add(transaction)
+        other.save_indexed(data, file_name)
+
+
+def numbers_on_disk(app):
+    with open(app.get_current_month_file(), "r") as f:
+        return [t["transaction_number"] for t in json.load(f)["transactions"]]
+
+
+def test_new_transaction_keeps_what_another_terminal_saved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = load_app()
+    file_name = app.get_current_month_file()
+    data, index = app.load_indexed(file_name)  # dashboard: empty month cached
+    other_terminal_saves(app, "X1")
+    # even a cache that claims to match the file must not be saved over it
+    app._loaded[file_name] = (app.file_signature(file_name), data, index)
+
+    # Cedula for Juan Cruz: type, names, house number, street, age, purpose, income, no more
+    answers = iter(["2", "Juan", "Cruz", "1", "1", "30", "work", "1000", "n"])
+    monkeypatch.setattr(builtins, "input", lambda *args: next(answers))
+    app.new_transaction()
+
+    numbers = numbers_on_disk(app)
+    assert len(numbers) == 2 and "X1" in numbers
+
+
+def test_cache_is_not_tagged_with_a_newer_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = load_app()
+    file_name = app.get_current_month_file()
+    app.load_data(file_name)  # empty month file
+
+    real_load = json.load
+    saved = []
+
+    def load_then_other_terminal_saves(f):
+        data = real_load(f)
+        if not saved:  # another terminal saves right after we read the file
+            saved.append(True)
+            other_terminal_saves(app, "X1")
+        return data
+
+    monkeypatch.setattr(json, "load", load_then_other_terminal_saves)
+    app.load_indexed(file_name)
+    monkeypatch.setattr(json, "load", real_load)
+
+    data, index = app.load_indexed(file_name)
+    assert index.find_number("X1") is not None
@@ -0,0 +1,140 @@
+# archive_store.py
+# Cold store for archived patients: one gzip segment per archive month
+# (archive/archived_YYYY-MM.jsonl.gz, one patient per line). Archiving appends
+# a new gzip member to the month's segment, so old data is never rewritten.
+# Segments are read one member at a time: a damaged member (e.g. torn by a
+# crash mid-append) is skipped and the members after it are still read, and
+# a torn member at the end is cut off before the next append.
+import gzip
+import json
+import os
+import zlib
+from datetime import date
+
+from records import Patient, to_json
+
+SEGMENT_PREFIX = "archived_"
+SEGMENT_SUFFIX = ".jsonl.gz"
+GZIP_MAGIC = b"\x1f\x8b\x08"  # start of a gzip member (deflate)
+
+
+def segment_path(archive_dir, month):
+    """Segment file for a YYYY-MM archive month."""
+    return os.path.join(archive_dir, f"{SEGMENT_PREFIX}{month}{SEGMENT_SUFFIX}")
+
+
+def list_segments(archive_dir):
+    """Segment files, oldest month first."""
+    if not os.path.isdir(archive_dir):
+        return []
+    return [
+        os.path.join(archive_dir, name)
+        for name in sorted(os.listdir(archive_dir))
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    ]
+
+
+def _members(data):
+    """
+    (start, end, text) for each gzip member in a segment's bytes, in order.
+    A member that doesn't decompress is reported with text None and skipped
+    up to the next gzip header; a torn last member runs to the end of data.
+    """
+    view = memoryview(data)
+    start = 0
+    while start < len(data):
+        d = zlib.decompressobj(wbits=31)
+        try:
+            text = d.decompress(view[start:])
+        except zlib.error:
+            text = None
+        if text is not None and d.eof:
+            end = len(data) - len(d.unused_data)
+            yield start, end, text
+            start = end
+            continue
+        resume = data.find(GZIP_MAGIC, start + 1)
+        end = resume if resume >= 0 else len(data)
+        yield start, end, None
+        start = end
+
+
+def _cut_torn_tail(path):
+    """Truncate a segment that ends in a torn member so the next append stays readable."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return
+    last = None
+    for last in _members(data):
+        pass
+    if last is not None and last[2] is None and last[1] == len(data):
+        with open(path, "r+b") as f:
+            f.truncate(last[0])
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"⚠️ {os.path.basename(path)} ended with an incomplete entry; it was removed.")
+
+
+def append_archived(patients, archive_dir, month=None):
+    """Append patients to this month's segment (one new gzip member, fsynced)."""
+    if not patients:
+        return
+    os.makedirs(archive_dir, exist_ok=True)
+    month = month or date.today().strftime("%Y-%m")
+    path = segment_path(archive_dir, month)
+    _cut_torn_tail(path)
+    lines = "".join(json.dumps(p, ensure_ascii=False, default=to_json) + "\n" for p in patients)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            gz.write(lines.encode("utf-8"))
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _read_segment(path):
+    """Dicts from one segment, member by member; damaged members are skipped with a warning."""
+    with open(path, "rb") as f:
+        data = f.read()
+    for _, _, text in _members(data):
+        if text is None:
+            print(f"⚠️ {os.path.basename(path)} has an incomplete entry; it was skipped.")
+            continue
+        for line in text.decode("utf-8").splitlines():
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"⚠️ {os.path.basename(path)} has an unreadable line; it was skipped.")
+
+
+def iter_archived(archive_dir):
+    """
+    Stream archived patients, oldest segment first, as Patient records.
+    A patient that was archived twice (e.g. crash between archive and
+    active-file save) is only yielded once.
+    """
+    seen = set()
+    for path in list_segments(archive_dir):
+        for d in _read_segment(path):
+            pid = d.get("id")
+            if pid in seen:
+                continue
+            seen.add(pid)
+            yield Patient.from_dict(d)
+
+
+def migrate_legacy(legacy_file, archive_dir, load, save):
+    """
+    Move records from the old single archived_patients.json into a segment
+    (once). `load`/`save` are data_handler's JSON helpers for that file.
+    """
+    if not os.path.exists(legacy_file) or os.path.getsize(legacy_file) == 0:
+        return 0
+    legacy = load(legacy_file)
+    if not legacy:
+        return 0
+    append_archived(legacy, archive_dir)
+    save([], legacy_file)
+    return len(legacy)
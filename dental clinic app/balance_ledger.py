@@ -0,0 +1,136 @@
+# balance_ledger.py
+# Running receivables ledger. Built once per loaded list and updated per
+# patient on every procedure/payment, so balance views don't rescan everyone.
+from bisect import bisect_left, insort
+
+
+def _owes(patient):
+    """Outstanding balance counted by the ledger (active, unpaid, > 0), else 0."""
+    if not patient.get("isActive", True) or patient.get("status") != "unpaid":
+        return 0.0
+    balance = float(patient.get("balance", 0) or 0)
+    return balance if balance > 0 else 0.0
+
+
+class BalanceLedger:
+    """Per-patient outstanding totals, a clinic-wide total and a largest-first ranking."""
+
+    def __init__(self):
+        self.source = None   # patient list this ledger was built from
+        self.patients = {}   # id -> patient
+        self.owed = {}       # id -> outstanding amount counted in total
+        self.entries = {}    # id -> its (-amount, seq, id) entry in ranked
+        self.ranked = []     # sorted (-amount, seq, id), largest balance first
+        self.unpaid = set()  # ids of active patients with status "unpaid"
+        self.total = 0.0
+        self._seq = 0
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        for p in patients:
+            self.patients[p.get("id")] = p
+            entry = self._count(p)
+            if entry is not None:
+                self.ranked.append(entry)
+        self.ranked.sort()
+
+    def _count(self, patient):
+        pid = patient.get("id")
+        if patient.get("isActive", True) and patient.get("status") == "unpaid":
+            self.unpaid.add(pid)
+        amount = _owes(patient)
+        if not amount:
+            return None
+        self.owed[pid] = amount
+        self.total += amount
+        entry = (-amount, self._seq, pid)
+        self._seq += 1
+        self.entries[pid] = entry
+        return entry
+
+    def add(self, patient):
+        pid = patient.get("id")
+        if pid in self.patients:
+            self.remove(patient)
+        self.patients[pid] = patient
+        entry = self._count(patient)
+        if entry is not None:
+            insort(self.ranked, entry)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        self.patients.pop(pid, None)
+        self.unpaid.discard(pid)
+        self.total -= self.owed.pop(pid, 0.0)
+        entry = self.entries.pop(pid, None)
+        if entry is not None:
+            i = bisect_left(self.ranked, entry)
+            if i < len(self.ranked) and self.ranked[i] == entry:
+                del self.ranked[i]
+        if not self.owed:
+            self.total = 0.0  # drop float drift once nothing is owed
+
+    def update(self, patient):
+        """Re-count a patient after a procedure or payment was recorded."""
+        self.remove(patient)
+        self.add(patient)
+
+    # ----------------- queries -----------------
+
+    def unpaid_count(self):
+        return len(self.unpaid)
+
+    def largest(self, n=None):
+        """(patient, amount) pairs, largest outstanding balance first."""
+        entries = self.ranked if n is None else self.ranked[:n]
+        return [(self.patients[pid], -neg) for neg, _, pid in entries]
+
+    def verify(self):
+        """
+        Compare the running totals with a full recompute from the patients.
+        Returns a list of mismatches (empty list = ledger is correct).
+        """
+        problems = []
+        owed = {pid: _owes(p) for pid, p in self.patients.items()}
+        owed = {pid: amount for pid, amount in owed.items() if amount}
+        unpaid = {
+            pid for pid, p in self.patients.items()
+            if p.get("isActive", True) and p.get("status") == "unpaid"
+        }
+        if set(owed) != set(self.owed):
+            problems.append("patients with a balance differ from the ledger")
+        for pid, amount in owed.items():
+            if abs(self.owed.get(pid, 0.0) - amount) > 0.005:
+                p = self.patients[pid]
+                problems.append(f"{p.get('firstName','')} {p.get('lastName','')}: "
+                                f"ledger ₱{self.owed.get(pid, 0.0)} vs ₱{amount}")
+        if abs(sum(owed.values()) - self.total) > 0.005:
+            problems.append(f"total: ledger ₱{self.total} vs ₱{sum(owed.values())}")
+        if unpaid != self.unpaid:
+            problems.append(f"unpaid count: ledger {len(self.unpaid)} vs {len(unpaid)}")
+        return problems
+
+
+_ledger = BalanceLedger()
+
+
+def get_ledger(patients):
+    """Return the shared ledger for this patient list, building it if needed."""
+    if _ledger.source is not patients or len(_ledger.patients) != len(patients):
+        _ledger.build(patients)
+    return _ledger
+
+
+def ledger_patient(patients, patient):
+    """Re-count one patient after create/update."""
+    if _ledger.source is patients:
+        _ledger.update(patient)
+    else:
+        _ledger.build(patients)
+
+
+def unledger_patient(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _ledger.source is patients:
+        _ledger.remove(patient)
@@ -0,0 +1,60 @@
+# batch_import.py
+# Import a batch of clinic operations from CSV or JSONL without the menus.
+# All operations are applied in memory and saved with a single write.
+#
+# Usage: python batch_import.py <operations.csv | operations.jsonl>
+#
+# Each row/line is one operation. "op" is one of: create_patient, update_info,
+# add_procedure, record_payment, reschedule, mark_visited. The patient is
+# found by "id" or "contact"; other columns: first_name, last_name, bday,
+# new_contact, name, amount, date, schedule.
+#   op,contact,name,amount,date
+#   add_procedure,09171234567,Cleaning,800,2025-11-20
+import csv
+import json
+import sys
+import time
+
+from data_handler import load_data
+from clinic_service import ConflictError, apply_batch
+
+
+def read_operations(path):
+    """Operation dicts from a .csv (header row) or .jsonl/.json-lines file."""
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    # blank cells mean "not given", not "set to empty"
+    return [
+        {k.strip(): v.strip() if isinstance(v, str) else v
+         for k, v in row.items() if k and v not in (None, "")}
+        for row in rows
+    ]
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python batch_import.py <operations.csv | operations.jsonl>")
+        sys.exit(1)
+
+    operations = read_operations(sys.argv[1])
+    patients = load_data()
+    start = time.perf_counter()
+    try:
+        applied, errors = apply_batch(patients, operations)
+    except ConflictError as e:
+        print(f"❌ Nothing was imported: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    for n, message in errors:
+        print(f"❌ Operation {n}: {message}")
+    rate = applied / elapsed if elapsed else 0
+    print(f"✅ Applied {applied} of {len(operations)} operations in {elapsed:.2f}s ({rate:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
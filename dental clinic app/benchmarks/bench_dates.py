@@ -0,0 +1,64 @@
+# bench_dates.py
+# Archive-sweep throughput: the old strptime-per-patient check vs
+# data_handler.split_inactive (cached slicing parser from dates.py).
+# Usage: python benchmarks/bench_dates.py [count]   (default 1000000)
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dates
+from data_handler import split_inactive
+from gen_dataset import synthetic_patients
+
+
+def split_inactive_strptime(patients, today):
+    """The sweep as it used to be: two strptime formats per patient."""
+    active = []
+    moved = []
+    for p in patients:
+        last_str = p.get("lastUpdated", date.today().isoformat())
+        try:
+            last_updated = datetime.strptime(last_str, "%Y-%m-%d").date()
+        except Exception:
+            try:
+                last_updated = datetime.strptime(last_str, "%Y-%m-%d %H:%M:%S").date()
+            except Exception:
+                last_updated = today
+        if today - last_updated > timedelta(days=90) or not p.get("isActive", True):
+            moved.append(p)
+        else:
+            active.append(p)
+    return active, moved
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Synthetic dataset: {count:,} patients")
+    patients = synthetic_patients(count)
+    today = date.today()
+
+    (old_active, old_moved), old_s = timed(lambda: split_inactive_strptime(patients, today))
+    dates._cache.clear()
+    (_, moved), cold_s = timed(lambda: split_inactive(patients, today))
+    for p in moved:
+        p["isActive"] = True  # undo the flag so the warm run sees the same input
+    (new_active, new_moved), warm_s = timed(lambda: split_inactive(patients, today))
+
+    same = [p["id"] for p in old_moved] == [p["id"] for p in new_moved]
+    print(f"strptime sweep   : {old_s:6.2f}s ({count / old_s:12,.0f} patients/s)")
+    print(f"ordinal (cold)   : {cold_s:6.2f}s ({count / cold_s:12,.0f} patients/s)  {old_s / cold_s:5.1f}x")
+    print(f"ordinal (warm)   : {warm_s:6.2f}s ({count / warm_s:12,.0f} patients/s)  {old_s / warm_s:5.1f}x")
+    print(f"moved            : {len(new_moved):,} of {count:,} ({'same' if same else 'DIFFERENT'} patients as before)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# bench_memory.py
+# Per-record memory of plain dict patients vs Patient/Procedure records, and
+# of records whose procedure history stays in the history store.
+# Usage: python benchmarks/bench_memory.py [count]   (default 200000)
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import summarize, to_patients
+from gen_dataset import synthetic_patients
+
+
+def measure(build):
+    """(bytes allocated by build(), seconds) with tracemalloc."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def copy_dicts(patients):
+    """Fresh dict containers (strings/numbers shared), like json.load would build."""
+    return [dict(p, procedure=[dict(pr) for pr in p["procedure"]]) for p in patients]
+
+
+def stored_dicts(patients):
+    """Snapshot entries with the history replaced by its summary and location."""
+    stored = []
+    for p in patients:
+        count, total, paid = summarize(p["procedure"])
+        entry = {k: v for k, v in p.items() if k != "procedure"}
+        entry["history"] = {"count": count, "total": total, "paid": paid, "file": 1, "offset": 0, "length": 0}
+        stored.append(entry)
+    return stored
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Synthetic dataset: {count:,} patients")
+    source = synthetic_patients(count)
+
+    # Both sides share the same field values, so only the containers are compared
+    dicts, dict_bytes, _ = measure(lambda: copy_dicts(source))
+    del dicts
+    records, record_bytes, convert_s = measure(lambda: to_patients(source))
+    del records
+    stored = stored_dicts(source)
+    _, lazy_bytes, lazy_s = measure(lambda: to_patients(stored))
+
+    print(f"dict patients    : {dict_bytes / count:8.1f} bytes/patient ({dict_bytes / 2**20:7.1f} MiB)")
+    print(f"Patient records  : {record_bytes / count:8.1f} bytes/patient ({record_bytes / 2**20:7.1f} MiB)")
+    print(f"saved            : {1 - record_bytes / dict_bytes:8.1%}")
+    print(f"stored histories : {lazy_bytes / count:8.1f} bytes/patient ({lazy_bytes / 2**20:7.1f} MiB)")
+    print(f"saved            : {1 - lazy_bytes / dict_bytes:8.1%}")
+    print(f"dict -> records  : {convert_s:.2f}s ({count / convert_s:,.0f} patients/s)")
+    print(f"stored -> records: {lazy_s:.2f}s ({count / lazy_s:,.0f} patients/s)")
+
+
+if __name__ == "__main__":
+    main()
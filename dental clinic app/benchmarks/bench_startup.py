@@ -0,0 +1,90 @@
+# bench_startup.py
+# Startup (cold load_data in a fresh process) and reload (load_data after
+# another terminal rewrote the snapshot) of the active file: indented vs
+# compact JSON, with and without the binary snapshot cache.
+# Usage: python benchmarks/bench_startup.py [count]   (default 100000)
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from gen_dataset import dataset_file
+
+RUNS = 3  # fresh processes per measurement (best is reported)
+
+
+def child(mode):
+    """Runs inside the data directory with the DENTAL_* settings of the configuration."""
+    import clinic_service as service
+    import data_handler
+
+    if mode == "prepare":
+        # externalize histories and write the snapshot in this configuration's format
+        data_handler.save_data(data_handler.load_data())
+        return {"bytes": os.path.getsize(data_handler.ACTIVE_FILE)}
+    if mode == "write":
+        # "another terminal": edit one patient and fold the journal into a new snapshot
+        patients = data_handler.load_data()
+        service.update_info(patients, patients[0], first_name=patients[0].firstName)
+        data_handler.compact_journal()
+        return {}
+
+    start = time.perf_counter()
+    patients = data_handler.load_data()
+    cold = time.perf_counter() - start
+    if mode == "cold":
+        return {"seconds": cold, "patients": len(patients)}
+    run([sys.executable, os.path.abspath(__file__), "--child", "write"], os.getcwd(), os.environ)
+    start = time.perf_counter()
+    patients = data_handler.load_data()
+    return {"seconds": time.perf_counter() - start, "patients": len(patients)}
+
+
+def run(args, cwd, env):
+    proc = subprocess.run(args, cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr)
+        raise SystemExit("❌ A benchmark process failed.")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(work_dir, compact, cache):
+    env = dict(os.environ, DENTAL_COMPACT_JSON="1" if compact else "0", DENTAL_SNAPSHOT_CACHE="1" if cache else "0")
+    script = [sys.executable, os.path.abspath(__file__), "--child"]
+    size = run(script + ["prepare"], work_dir, env)["bytes"]
+    cold = min(run(script + ["cold"], work_dir, env)["seconds"] for _ in range(RUNS))
+    reload = min(run(script + ["reload"], work_dir, env)["seconds"] for _ in range(RUNS))
+    return size, cold, reload
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        print(json.dumps(child(sys.argv[2])))
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Synthetic dataset: {count:,} patients (best of {RUNS} fresh processes)")
+    work_dir = tempfile.mkdtemp(prefix="dental_startup_")
+    try:
+        shutil.copy(dataset_file(count), os.path.join(work_dir, "active_patients.json"))
+        rows = []
+        for compact in (False, True):
+            for cache in (False, True):
+                rows.append((compact, cache) + measure(work_dir, compact, cache))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    base_cold, base_reload = rows[0][3], rows[0][4]
+    print(f"{'snapshot':10} {'cache':6} {'JSON MiB':>9} {'cold s':>8} {'reload s':>9} {'cold x':>7} {'reload x':>9}")
+    for compact, cache, size, cold, reload in rows:
+        print(f"{'compact' if compact else 'indent=4':10} {'on' if cache else 'off':6} {size / 2**20:9.1f} "
+              f"{cold:8.2f} {reload:9.2f} {base_cold / cold:7.1f} {base_reload / reload:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# bench_suite.py
+# Non-interactive timings of the main dental clinic operations on synthetic
+# patient files. Each size runs in its own process so peak RSS is per size.
+#
+# Usage: python benchmarks/bench_suite.py [--sizes 1000,10000,100000,1000000]
+#                                         [--out results.json] [--compare old.json]
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import clinic_service
+import data_handler
+import patient_ops
+import scheduler
+from balance_ledger import BalanceLedger
+from dedup import DedupIndex, possible_duplicates
+from gen_dataset import FIRST_NAMES, LAST_NAMES, dataset_file
+from patient_index import PatientIndex, search_patients
+from records import Patient
+from reports import ReportColumns, get_reports
+from schedule_index import ScheduleIndex
+from scheduler import SlotIndex
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DAY_APPOINTMENTS = 200  # "rebook a full day" moves this many appointments
+DAY_CHAIRS = 10         # 20 half-hour slots x 10 chairs = 200 a day
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+REGRESSION_RATIO = 1.2  # p50 more than 20% slower than the compared run
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MiB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (2**20 if sys.platform == "darwin" else 1024), 1)
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; return (stats dict, last result)."""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    total = sum(samples)
+    stats = {
+        "runs": repeat,
+        "ops_per_sec": round(repeat / total, 2) if total else None,
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+    }
+    return stats, result
+
+
+def run_size(count):
+    """
+    Time every operation on a `count`-patient file. Runs in a worker process
+    started inside an empty temporary directory: data_handler's default file
+    names (used by the commits) resolve there.
+    """
+    work_dir = os.getcwd()
+    active_file = os.path.join(work_dir, "active_patients.json")
+    archive_file = os.path.join(work_dir, "archived_patients.json")
+    shutil.copy(dataset_file(count), active_file)
+    data_handler.ACTIVE_FILE = active_file
+    data_handler.ARCHIVE_FILE = archive_file
+    data_handler.ARCHIVE_DIR = os.path.join(work_dir, "archive")
+
+    heavy = max(3, min(20, 100_000 // count))    # full loads / sweeps / index builds
+    light = max(20, min(1000, 2_000_000 // count))  # resident reads
+    results = {}
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    try:
+        def cold_load():
+            data_handler._store.clear()
+            return data_handler.load_data(active_file)
+
+        results["load_data (cold)"], patients = timed(cold_load, heavy)
+        results["load_data (resident)"], patients = timed(lambda: data_handler.load_data(active_file), light)
+
+        results["auto_archive_inactive (first sweep)"], patients = timed(
+            lambda: data_handler.auto_archive_inactive(patients), 1)
+        results["auto_archive_inactive (steady)"], patients = timed(
+            lambda: data_handler.auto_archive_inactive(patients), heavy)
+
+        # the sweep's save moved the procedure histories out of the snapshot
+        data_handler.save_data(patients)
+        results["load_data (cold, stored histories)"], patients = timed(cold_load, heavy)
+
+        results["index build: names"], _ = timed(lambda: PatientIndex().build(patients), heavy)
+        results["index build: schedule"], _ = timed(lambda: ScheduleIndex().build(patients), heavy)
+        results["index build: ledger"], _ = timed(lambda: BalanceLedger().build(patients), heavy)
+        results["index build: report columns"], _ = timed(lambda: ReportColumns().build(patients), heavy)
+        results["index build: slots"], _ = timed(lambda: SlotIndex().build(patients), heavy)
+        results["index build: dedup"], _ = timed(lambda: DedupIndex().build(patients), heavy)
+
+        # the same person registered again with a new phone number: only the
+        # birthday + surname block links them, and it must still be reported
+        known = patients[0]
+        again = Patient(firstName=known.firstName, lastName=known.lastName, bday=known.bday,
+                        contact="09990000000", id="bench-duplicate")
+
+        def check_duplicate():
+            found = possible_duplicates(patients, again)
+            assert any(p is known for _, p in found), f"{known.firstName} {known.lastName} not reported"
+            return found
+        results["dedup: new patient check"], _ = timed(check_duplicate, light)
+
+        # a full day of appointments moved to another day in one batch (one journal write)
+        scheduler.CHAIRS = DAY_CHAIRS
+        day_patients = patients[:DAY_APPOINTMENTS]
+        days = iter([date.fromordinal(date.today().toordinal() + 30 + n).isoformat() for n in range(heavy + 1)])
+
+        def rebook_day():
+            target = next(days)
+            applied, errors = clinic_service.apply_batch(
+                patients, [{"op": "reschedule", "id": p.id, "schedule": target} for p in day_patients])
+            assert not errors, errors[:3]
+            return applied
+        rebook_day()  # book the first day
+        results[f"reschedule: rebook day ({DAY_APPOINTMENTS})"], _ = timed(rebook_day, heavy)
+
+        report = get_reports(patients)
+        month = date.today().year * 12 + date.today().month - 1
+
+        def month_end():
+            return (report.revenue_by_procedure(month), report.revenue_by_month(),
+                    report.aging(), report.collection_rate(month))
+        results["report: month-end"], _ = timed(month_end, light)
+
+        rng = random.Random(7)
+        queries = [rng.choice(FIRST_NAMES + LAST_NAMES)[:rng.randint(3, 6)] for _ in range(64)]
+        queries += [patients[rng.randrange(len(patients))].contact for _ in range(16)]
+        search_patients(patients, "")  # build the shared index outside the timing
+        query_iter = iter(queries * (light // len(queries) + 1))
+        results["find_patient (search)"], _ = timed(
+            lambda: search_patients(patients, next(query_iter)), light)
+
+        with contextlib.redirect_stdout(devnull):
+            results["view_schedule"], _ = timed(lambda: patient_ops.view_schedule(patients), heavy)
+            results["view_balance_stats"], _ = timed(lambda: patient_ops.view_balance_stats(patients), heavy)
+            results["dashboard"], _ = timed(lambda: patient_ops.dashboard(patients), light)
+    finally:
+        devnull.close()
+
+    return {"patients": count, "peak_rss_mb": peak_rss_mb(), "operations": results}
+
+
+def run_all(sizes):
+    """Run each size in a fresh interpreter and collect the results."""
+    runs = {}
+    for count in sizes:
+        print(f"⏱️  {count:,} patients...", flush=True)
+        work_dir = tempfile.mkdtemp(prefix="dental_bench_")
+        try:
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", str(count)],
+                cwd=work_dir, capture_output=True, text=True,
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        if proc.returncode != 0:
+            print(proc.stderr)
+            raise SystemExit(f"❌ Benchmark for {count:,} patients failed.")
+        runs[str(count)] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": data_handler.STORAGE_BACKEND,
+        "runs": runs,
+    }
+
+
+def print_report(report, previous=None):
+    for size, run in report["runs"].items():
+        print(f"\n=== {int(size):,} patients | peak RSS: {run['peak_rss_mb']} MiB ===")
+        print(f"{'operation':40} {'ops/sec':>12} {'p50 ms':>10} {'p99 ms':>10}")
+        old_ops = (previous or {}).get("runs", {}).get(size, {}).get("operations", {})
+        for name, stats in run["operations"].items():
+            line = f"{name:40} {stats['ops_per_sec'] or 0:>12,.1f} {stats['p50_ms']:>10.3f} {stats['p99_ms']:>10.3f}"
+            old = old_ops.get(name)
+            if old and old["p50_ms"]:
+                ratio = stats["p50_ms"] / old["p50_ms"]
+                flag = "  ⚠️ REGRESSION" if ratio > REGRESSION_RATIO else ""
+                line += f"  ({ratio:.2f}x vs previous){flag}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dental clinic app benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated patient counts")
+    parser.add_argument("--out", help="where to save the JSON results")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_size(args.worker)))
+        return
+
+    report = run_all([int(s) for s in args.sizes.split(",") if s.strip()])
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    out = args.out
+    if not out:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"\n💾 Results saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
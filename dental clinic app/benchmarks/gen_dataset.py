@@ -0,0 +1,92 @@
+# gen_dataset.py
+# Synthetic patient files in the active_patients.json shape, for benchmarks.
+# Usage: python benchmarks/gen_dataset.py <count> [output.json]
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+FIRST_NAMES = [
+    "Juan", "Maria", "Jose", "Ana", "Pedro", "Carla", "Miguel", "Sofia", "Luis", "Elena",
+    "Carlos", "Isabel", "Rafael", "Gabriela", "Diego", "Laura", "Hector", "Paula", "Emilio",
+    "Monica", "Alberto", "Sebastian", "Teresa", "Ramon", "Lucia", "Andres", "Rosa", "Mario",
+]
+LAST_NAMES = [
+    "Santos", "Lopez", "Reyes", "Cruz", "Garcia", "Ramos", "Torres", "Mendoza", "Flores",
+    "Gomez", "Valdez", "Herrera", "Salazar", "Aguilar", "Navarro", "Marquez", "Morales",
+    "Vargas", "Alvarez", "Castillo", "Gutierrez", "Castro", "Pineda", "Rojas", "Vega",
+    "Dela Cruz", "Bautista", "Villanueva", "Aquino", "Soriano", "Mercado", "Domingo",
+]
+PROCEDURES = {
+    "Cleaning": 800, "Filling": 1200, "Extraction": 1000, "Root Canal": 2500,
+    "Braces Adjustment": 1500, "Whitening": 3000, "Dentures": 5000, "Check-up": 500,
+}
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def synthetic_patients(count, seed=1, today=None):
+    """
+    Patients with 0-8 procedures each. Dates are relative to today: schedules
+    from 30 days ago to 60 days ahead and lastUpdated up to 120 days ago
+    (so roughly a quarter are due for archiving).
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+
+    def day(lo, hi):
+        return (today + timedelta(days=rng.randint(lo, hi))).isoformat()
+
+    names = list(PROCEDURES)
+    patients = []
+    for i in range(count):
+        procedures = []
+        for _ in range(rng.choice((0, 1, 1, 2, 2, 3, 4, 6, 8))):
+            name = rng.choice(names)
+            amount = PROCEDURES[name]
+            proc = {"name": name, "amount": amount, "date": day(-730, 0)}
+            paid = rng.choice((0, amount // 2, amount, amount, amount))
+            if paid:
+                proc["paid"] = paid
+            procedures.append(proc)
+        balance = sum(p["amount"] - p.get("paid", 0) for p in procedures)
+        patients.append({
+            "firstName": rng.choice(FIRST_NAMES),
+            "lastName": rng.choice(LAST_NAMES),
+            "bday": f"{rng.randint(1940, 2015)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "contact": f"09{rng.randint(0, 999999999):09d}",
+            "balance": balance,
+            "schedule": day(-30, 60) if rng.random() < 0.7 else "",
+            "scheduleStatus": rng.random() < 0.3,
+            "procedure": procedures,
+            "status": "unpaid" if balance > 0 else "paid",
+            "isActive": True,
+            "lastUpdated": day(-120, 0),
+            "id": f"{seed:04x}{i:028x}",
+        })
+    return patients
+
+
+def dataset_file(count, seed=1):
+    """Path of a generated dataset, writing it on first use (cached in benchmarks/data)."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"patients_{count}_{seed}_{date.today().isoformat()}.json")
+    if not os.path.exists(path):
+        write_dataset(synthetic_patients(count, seed), path)
+    return path
+
+
+def write_dataset(patients, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(patients, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python benchmarks/gen_dataset.py <count> [output.json]")
+        sys.exit(1)
+    n = int(sys.argv[1])
+    out = sys.argv[2] if len(sys.argv) > 2 else f"patients_{n}.json"
+    write_dataset(synthetic_patients(n), out)
+    print(f"✅ Wrote {n:,} patients to {out}")
@@ -0,0 +1,139 @@
+# stress_concurrency.py
+# Several app processes hammering the same active_patients.json at once.
+# Each worker adds ₱1 procedures to random patients from a small pool (lots of
+# contention), retrying on ConflictError; worker 1 also compacts the journal now
+# and then. At the end every successful add must be in the file exactly once.
+#
+# Usage: python benchmarks/stress_concurrency.py [--workers 4] [--ops 300] [--patients 20]
+#                                                [--think-ms 2]
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from gen_dataset import synthetic_patients, write_dataset
+
+COMPACT_EVERY = 75  # worker 1 folds the journal into the snapshot this often
+
+
+def worker(number, ops, think):
+    """Runs inside the data directory (data_handler paths are relative to the cwd)."""
+    import clinic_service as service
+    from data_handler import ConflictError, compact_journal, load_data
+
+    rng = random.Random(number)
+    patients = load_data()
+    added = conflicts = 0
+    start = time.perf_counter()
+    while added < ops:
+        patients = service.sync(patients)
+        patient = rng.choice(patients)
+        time.sleep(rng.random() * think)  # the user "typing": others may save meanwhile
+        try:
+            service.add_procedure(patients, patient, f"Stress {number}", 1)
+            added += 1
+        except ConflictError:
+            conflicts += 1
+        if number == 1 and added and added % COMPACT_EVERY == 0:
+            compact_journal()
+    return {"added": added, "conflicts": conflicts, "seconds": time.perf_counter() - start}
+
+
+def verify():
+    """Count what ended up on disk (fresh process, nothing resident)."""
+    from data_handler import load_data
+
+    patients = load_data()
+    procedures = sum(len(p.procedure) for p in patients)
+    wrong_balance = [
+        p.id for p in patients
+        if abs(float(p.balance) - sum(pr.amount for pr in p.procedure)) > 0.001
+    ]
+    return {
+        "patients": len(patients),
+        "distinct_ids": len({p.id for p in patients}),
+        "procedures": procedures,
+        "wrong_balance": wrong_balance,
+    }
+
+
+def run_child(args, cwd):
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__)] + args,
+        cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+
+
+def child_result(proc):
+    out, err = proc.communicate()
+    if proc.returncode != 0:
+        print(err)
+        raise SystemExit("❌ A stress process failed.")
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent writers stress test")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=300, help="successful adds per worker")
+    parser.add_argument("--patients", type=int, default=20)
+    parser.add_argument("--think-ms", type=float, default=2.0,
+                        help="random pause between reading a patient and saving it")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--verify", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.ops, args.think_ms / 1000)))
+        return
+    if args.verify:
+        print(json.dumps(verify()))
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="dental_stress_")
+    try:
+        patients = synthetic_patients(args.patients, seed=5)
+        for p in patients:
+            p.update(procedure=[], balance=0, status="paid")  # balance == number of adds
+        write_dataset(patients, os.path.join(work_dir, "active_patients.json"))
+
+        print(f"⏱️  {args.workers} processes x {args.ops} adds on {args.patients} patients...")
+        start = time.perf_counter()
+        procs = [run_child(["--worker", str(n), "--ops", str(args.ops), "--think-ms", str(args.think_ms)], work_dir)
+                 for n in range(1, args.workers + 1)]
+        results = [child_result(proc) for proc in procs]
+        elapsed = time.perf_counter() - start
+        check = child_result(run_child(["--verify"], work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    added = sum(r["added"] for r in results)
+    conflicts = sum(r["conflicts"] for r in results)
+    print(f"committed adds : {added:,} ({added / elapsed:,.0f}/s over {elapsed:.2f}s)")
+    print(f"conflicts      : {conflicts:,} ({conflicts / (added + conflicts):.1%} of attempts, retried)")
+    print(f"on disk        : {check['procedures']:,} procedures, {check['patients']} patients")
+
+    problems = []
+    if check["procedures"] != added:
+        problems.append(f"{added - check['procedures']} committed adds are missing from the file")
+    if check["distinct_ids"] != check["patients"] or check["patients"] != args.patients:
+        problems.append("patients were duplicated or lost")
+    if check["wrong_balance"]:
+        problems.append(f"{len(check['wrong_balance'])} patients have a balance that doesn't match their procedures")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ No lost or duplicated updates.")
+
+
+if __name__ == "__main__":
+    main()
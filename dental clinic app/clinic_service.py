@@ -0,0 +1,376 @@
+# clinic_service.py
+# Headless clinic operations: no input()/print(). The CLI in patient_ops is a
+# thin shell over these, and apply_batch() runs many operations with a single
+# write at the end (see batch_import.py for CSV/JSONL imports).
+# Invalid input raises ValueError with a message meant for the user.
+from datetime import date
+
+from data_handler import ConflictError, load_data, new_patient_id, record_changes, take_outside_changes
+from patient_index import search_patients, index_patient, unindex_patient
+from schedule_index import index_schedule, unindex_schedule
+from balance_ledger import ledger_patient, unledger_patient
+from dedup import dedup_patient, undedup_patient
+from reports import report_patient, unreport_patient
+from scheduler import (first_slot_from, format_time, get_slot_index, parse_time, slot_key,
+                       slot_patient, slot_ref, slot_start, unslot_patient)
+import scheduler
+from records import Patient, Procedure
+from dates import normalize_date, parse_ordinal
+from validation import contact_error, validate_date_str
+
+
+def commit(patients, changed, removed=()):
+    """
+    Persist created/edited (and deleted) patients in one write and refresh the
+    indexes. Raises ConflictError if another terminal saved one of them first;
+    they are then back to their saved state and nothing was written.
+    """
+    changed = list({id(p): p for p in changed}.values())  # same patient once
+    removed = list(removed)
+    if not changed and not removed:
+        return
+    try:
+        record_changes(changed, removed=removed)
+    finally:
+        _reindex_outside_changes(patients)
+    for patient in removed:
+        if any(p is patient for p in patients):
+            patients.remove(patient)
+        _unindex(patients, patient)
+    for patient in changed:
+        _index(patients, patient)
+
+
+def _index(patients, patient):
+    index_patient(patients, patient)
+    index_schedule(patients, patient)
+    ledger_patient(patients, patient)
+    dedup_patient(patients, patient)
+    report_patient(patients, patient)
+    slot_patient(patients, patient)
+
+
+def _unindex(patients, patient):
+    unindex_patient(patients, patient)
+    unindex_schedule(patients, patient)
+    unledger_patient(patients, patient)
+    undedup_patient(patients, patient)
+    unreport_patient(patients, patient)
+    unslot_patient(patients, patient)
+
+
+def _reindex_outside_changes(patients):
+    """Update the indexes for patients other terminals changed (already applied to the list)."""
+    updated, removed = take_outside_changes()
+    for patient in removed:
+        _unindex(patients, patient)
+    for patient in updated:
+        _index(patients, patient)
+
+
+def sync(patients):
+    """
+    Pick up what other terminals saved since the last call. Only their new
+    journal lines are read, and only the patients they touched are re-indexed.
+    Returns the current patient list.
+    """
+    current = load_data()
+    if current is patients:
+        _reindex_outside_changes(patients)
+    else:
+        take_outside_changes()  # a new list: the indexes rebuild from it anyway
+    return current
+
+
+def _touch(patient):
+    patient.lastUpdated = date.today().isoformat()
+
+
+def _amount(value, what="Amount"):
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {what.lower()}. Please enter a number.") from None
+    if amount < 0:
+        raise ValueError(f"{what} cannot be negative.")
+    return amount
+
+
+# ----------------- operations -----------------
+
+def create_patient(patients, first_name, last_name, bday, contact, commit_now=True):
+    """Add a new patient and return it."""
+    bday = (bday or "").strip()
+    if bday and not validate_date_str(bday):
+        raise ValueError("Invalid birthday format. Use YYYY-MM-DD.")
+    error = contact_error(contact)
+    if error:
+        raise ValueError(error)
+
+    patient = Patient(
+        firstName=first_name.strip(),
+        lastName=last_name.strip(),
+        bday=bday,
+        contact=contact,
+        balance=0.0,
+        schedule="",
+        scheduleStatus=False,  # means appointment pending
+        procedure=[],          # store history as list of Procedure records
+        status="paid",
+        isActive=True,
+        lastUpdated=date.today().isoformat(),
+        id=new_patient_id(),
+    )
+    patients.append(patient)
+    if commit_now:
+        commit(patients, [patient])
+    else:
+        index_patient(patients, patient)  # findable by later operations in the batch
+    return patient
+
+
+def update_info(patients, patient, first_name=None, last_name=None, contact=None, commit_now=True):
+    """Change name and/or contact (None = keep)."""
+    if contact is not None:
+        error = contact_error(contact)
+        if error:
+            raise ValueError(error)
+        patient.contact = contact
+    if first_name is not None:
+        patient.firstName = first_name.strip()
+    if last_name is not None:
+        patient.lastName = last_name.strip()
+    _touch(patient)
+    if commit_now:
+        commit(patients, [patient])
+
+
+def reschedule(patients, patient, schedule, time=None, chair=None, commit_now=True):
+    """
+    Book the next appointment: a date (YYYY-MM-DD) and a slot. `time` is the
+    slot start ("HH:MM"); without it the first free slot of that day is taken.
+    `chair` picks a chair, else the lowest free one. A full slot or day raises
+    ValueError naming the next free slot. The visit starts as not yet done.
+    """
+    # Always save as zero-padded format (YYYY-MM-DD)
+    schedule = normalize_date(schedule.strip()) if validate_date_str(schedule.strip()) else None
+    if schedule is None:
+        raise ValueError("Invalid date format. Please use YYYY-MM-DD.")
+
+    slots = get_slot_index(patients)
+    slots.remove(patient)  # the patient's current booking doesn't block the new one
+    try:
+        key, chair = _pick_slot(slots, parse_ordinal(schedule), time, chair)
+    except ValueError:
+        slots.add(patient)
+        raise
+    day, start = slot_start(key)
+    patient.schedule = day.isoformat()
+    patient["scheduleSlot"] = slot_ref(parse_time(start), chair)
+    patient.scheduleStatus = False
+    _touch(patient)
+    slots.add(patient)  # later operations in a batch see the chair as taken
+    if commit_now:
+        commit(patients, [patient])
+
+
+def _pick_slot(slots, day, time, chair):
+    """(slot number, chair) for a booking request, or ValueError."""
+    def next_free_text(key):
+        free_day, free_time = slot_start(slots.next_free(key))
+        return f"{free_day.isoformat()} {free_time}"
+
+    chairs = scheduler.CHAIRS
+    if not time:
+        first = day * scheduler.SLOTS_PER_DAY
+        if day == date.today().toordinal():
+            first = max(first, first_slot_from())  # no bookings in the past
+        key = slots.next_free(first)
+        if key >= (day + 1) * scheduler.SLOTS_PER_DAY:
+            raise ValueError(f"No free slot left on {date.fromordinal(day).isoformat()}. "
+                             f"Next free slot: {next_free_text(key)}.")
+        return key, slots.free_chair(key)
+
+    key = slot_key(day, parse_time(time))
+    if key is None:
+        last = format_time(scheduler.CLOSE_MINUTE - scheduler.SLOT_MINUTES)
+        raise ValueError(f"Invalid time. Appointments start every {scheduler.SLOT_MINUTES} minutes "
+                         f"from {format_time(scheduler.OPEN_MINUTE)} to {last} (HH:MM).")
+    if chair is None or chair == "":
+        chair = slots.free_chair(key)
+        if chair is None:
+            raise ValueError(f"{time} is fully booked ({chairs} chairs). Next free slot: {next_free_text(key)}.")
+        return key, chair
+    try:
+        chair = int(chair)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid chair number.") from None
+    if not 1 <= chair <= chairs:
+        raise ValueError(f"Chair must be between 1 and {chairs}.")
+    taken = slots.conflicts(key).get(chair)
+    if taken is not None:
+        raise ValueError(f"Chair {chair} is already booked at {time} by {taken.firstName} {taken.lastName}.")
+    return key, chair
+
+
+def mark_visited(patients, patient, commit_now=True):
+    """Mark the scheduled visit as done."""
+    if not patient.schedule:
+        raise ValueError("No schedule found for this patient.")
+    patient.scheduleStatus = True
+    _touch(patient)
+    if commit_now:
+        commit(patients, [patient])
+
+
+def add_procedure(patients, patient, name, amount, on=None, commit_now=True):
+    """Record a procedure and add its amount to the patient's balance."""
+    name = (name or "").strip()
+    if not name:
+        raise ValueError("Procedure name cannot be empty.")
+    amount = _amount(amount)
+    on = on or date.today().isoformat()
+    if not validate_date_str(on):
+        raise ValueError("Invalid procedure date. Use YYYY-MM-DD.")
+
+    if not isinstance(patient.procedure, list):
+        patient.procedure = []
+    patient.procedure.append(Procedure(name=name, amount=amount, date=on))
+    patient.balance = float(patient.balance) + amount
+    patient.status = "unpaid" if patient.balance > 0 else "paid"
+    _touch(patient)
+    if commit_now:
+        commit(patients, [patient])
+
+
+def record_payment(patients, patient, amount, commit_now=True):
+    """
+    Apply a payment to the oldest unpaid procedures first.
+    Returns the remaining balance.
+    """
+    payment = _amount(amount, "Payment")
+    total_balance = patient.balance
+    if total_balance <= 0:
+        raise ValueError("No balance to settle.")
+    if payment > total_balance:
+        raise ValueError(f"Payment cannot exceed the total balance of ₱{total_balance}.")
+
+    remaining_payment = payment
+    for p in patient.procedure:
+        unpaid = p.amount - p.get("paid", 0.0)
+        if unpaid <= 0:
+            continue  # already fully paid
+        if remaining_payment >= unpaid:
+            p.paid = p.get("paid", 0.0) + unpaid
+            remaining_payment -= unpaid
+        else:
+            p.paid = p.get("paid", 0.0) + remaining_payment
+            remaining_payment = 0
+            break
+
+    # Reduce balance by what was applied (no need to re-sum every procedure)
+    patient.balance = round(total_balance - (payment - remaining_payment), 2)
+    if patient.balance <= 0:
+        patient.balance = 0
+        patient.status = "paid"
+    else:
+        patient.status = "unpaid"
+    _touch(patient)
+    if commit_now:
+        commit(patients, [patient])
+    return patient.balance
+
+
+def merge_patients(patients, keep, drop):
+    """
+    Merge a duplicate record into `keep`: procedure histories are combined
+    (oldest first), balances added, and blank fields filled from `drop`.
+    `drop` is removed from the list and deleted from storage.
+    """
+    if keep is drop or keep.id == drop.id:
+        raise ValueError("Cannot merge a patient with itself.")
+    procedures = [pr for p in (keep, drop) if isinstance(p.procedure, list) for pr in p.procedure]
+    procedures.sort(key=lambda pr: pr.get("date") or "")
+    keep.procedure = procedures
+    keep.balance = round(float(keep.balance or 0) + float(drop.balance or 0), 2)
+    keep.status = "unpaid" if keep.balance > 0 else "paid"
+    for field in ("firstName", "lastName", "bday", "contact"):
+        if not keep.get(field) and drop.get(field):
+            keep[field] = drop[field]
+    if not keep.schedule and drop.schedule:
+        keep.schedule, keep.scheduleStatus = drop.schedule, drop.scheduleStatus
+        if drop.get("scheduleSlot"):
+            keep["scheduleSlot"] = drop["scheduleSlot"]  # drop's chair is freed as it's removed
+    _touch(keep)
+
+    # one journal write: keep's new state and drop's deletion land together
+    commit(patients, [keep], removed=[drop])
+    return keep
+
+
+# ----------------- batches -----------------
+
+OPERATIONS = {
+    "create_patient": lambda patients, p, op: create_patient(
+        patients, op.get("first_name", ""), op.get("last_name", ""), op.get("bday", ""),
+        op.get("contact", ""), commit_now=False),
+    "update_info": lambda patients, p, op: update_info(
+        patients, p, op.get("first_name"), op.get("last_name"), op.get("new_contact"), commit_now=False),
+    "add_procedure": lambda patients, p, op: add_procedure(
+        patients, p, op.get("name"), op.get("amount"), op.get("date"), commit_now=False),
+    "record_payment": lambda patients, p, op: record_payment(patients, p, op.get("amount"), commit_now=False),
+    "reschedule": lambda patients, p, op: reschedule(
+        patients, p, op.get("schedule", ""), op.get("time"), op.get("chair"), commit_now=False),
+    "mark_visited": lambda patients, p, op: mark_visited(patients, p, commit_now=False),
+}
+
+
+def resolve_patient(patients, op, by_id=None):
+    """Find the patient an operation refers to, by "id" or exact "contact"."""
+    if op.get("id"):
+        if by_id is None:
+            by_id = {p.id: p for p in patients}
+        patient = by_id.get(op["id"])
+        if patient is None:
+            raise ValueError(f"No patient with id {op['id']}.")
+        return patient
+    contact = (op.get("contact") or "").strip()
+    if not contact:
+        raise ValueError("Operation needs an 'id' or 'contact' to find the patient.")
+    matches = search_patients(patients, contact, mode="contact")
+    if not matches:
+        raise ValueError(f"No patient with contact {contact}.")
+    if len(matches) > 1:
+        raise ValueError(f"{len(matches)} patients share contact {contact}; use 'id'.")
+    return matches[0]
+
+
+def apply_batch(patients, operations):
+    """
+    Run a list of operation dicts ({"op": "add_procedure", "contact": ..., ...})
+    and commit every touched patient in one write at the end.
+    Returns (number applied, [(operation number, error message), ...]).
+    Operations that fail are skipped; the rest are still committed.
+    Raises ConflictError (nothing written) if another terminal saved one of
+    the touched patients meanwhile.
+    """
+    changed = []
+    errors = []
+    by_id = {p.id: p for p in patients}
+    for n, op in enumerate(operations, 1):
+        try:
+            action = OPERATIONS.get(op.get("op"))
+            if action is None:
+                raise ValueError(f"Unknown operation '{op.get('op')}'.")
+            if op.get("op") == "create_patient":
+                patient = action(patients, None, op)
+                by_id[patient.id] = patient
+                changed.append(patient)
+            else:
+                patient = resolve_patient(patients, op, by_id)
+                action(patients, patient, op)
+                changed.append(patient)
+        except ValueError as e:
+            errors.append((n, str(e)))
+    commit(patients, changed)
+    return len(changed), errors
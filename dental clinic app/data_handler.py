@@ -1,8 +1,17 @@
 import json
 import os
 import sys
+import uuid
 from datetime import date, datetime, timedelta
 
+import archive_store
+import history_store
+import snapshot_cache
+import sqlite_store
+from dates import parse_ordinal
+from file_lock import held, locked
+from records import Patient, load_histories, to_json, to_patients, to_stored_json
+
 def resource_path(relative_path):
     """
     Get absolute path to resource, works for both development and PyInstaller .exe
@@ -15,50 +24,620 @@ def resource_path(relative_path):
 
 # File paths (safe for PyInstaller)
 ACTIVE_FILE = resource_path("active_patients.json")
-ARCHIVE_FILE = resource_path("archived_patients.json")
+ARCHIVE_FILE = resource_path("archived_patients.json")  # legacy single-file archive
+ARCHIVE_DIR = resource_path("archive")                   # monthly gzip segments
+DB_FILE = resource_path("dental_clinic.db")
 
-def load_data(file=ACTIVE_FILE):
-    """Load patient data from JSON file."""
-    if not os.path.exists(file):
-        return []
-    with open(file, "r", encoding="utf-8") as f:
+# "json" (default) or "sqlite". With sqlite, ACTIVE_FILE/ARCHIVE_FILE mean the
+# active/archived rows of DB_FILE (import the JSON files with sqlite_store.py).
+STORAGE_BACKEND = os.environ.get("DENTAL_STORAGE", "json").lower()
+
+# Startup reads the active snapshot from a pickled copy of its records when that
+# copy matches the JSON file (DENTAL_SNAPSHOT_CACHE=0 turns it off)
+SNAPSHOT_CACHE = os.environ.get("DENTAL_SNAPSHOT_CACHE", "1") != "0"
+
+# DENTAL_COMPACT_JSON=1 writes snapshots without indentation (about half the
+# size and faster to parse, but no longer meant to be read by hand)
+JSON_INDENT = None if os.environ.get("DENTAL_COMPACT_JSON", "0") == "1" else 4
+JSON_SEPARATORS = (",", ":") if JSON_INDENT is None else None
+
+# Journal grows with every edit; fold it back into the snapshot past this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Previous snapshots kept as <file>.bak1 (newest) .. .bakN for crash recovery
+BACKUP_GENERATIONS = 2
+
+# Resident patient lists for this session: file -> (disk signature, patients).
+# load_data only goes back to disk when the signature changes.
+_store = {}
+
+# file -> (snapshot signature, journal bytes already applied to the resident list)
+_positions = {}
+
+# file -> ({id: patient} updated, {id: patient} removed) by other terminals,
+# applied to the resident list but not yet to the indexes (see take_outside_changes)
+_outside_changes = {}
+
+# Patients not updated for more than this many days are archived
+INACTIVE_DAYS = 90
+
+# Date of the last archive sweep (runs on startup, then once per day)
+_last_archive_day = None
+
+class DataFileError(Exception):
+    """A data file is unreadable and no backup generation could replace it."""
+
+class _NeedsWriteLock(Exception):
+    """A read found something to repair on disk, which needs the exclusive lock."""
+
+class ConflictError(ValueError):
+    """Another terminal saved a patient after this one read it (nothing was written)."""
+
+    def __init__(self, patients):
+        self.patients = patients
+        names = ", ".join(f"{p.get('firstName', '')} {p.get('lastName', '')}".strip() for p in patients)
+        super().__init__(
+            f"{names or 'This patient'} was changed in another window first. "
+            "The latest saved data was reloaded; please make the change again."
+        )
+
+def journal_path(file=ACTIVE_FILE):
+    """Return the append-only journal file that belongs to a snapshot file."""
+    return os.path.splitext(file)[0] + ".journal"
+
+def new_patient_id():
+    """Return a new stable patient id (used to match journal entries)."""
+    return uuid.uuid4().hex
+
+def ensure_ids(patients):
+    """Give every patient an 'id'. Returns True if any id was added."""
+    added = False
+    for p in patients:
+        if not p.get("id"):
+            p["id"] = new_patient_id()
+            added = True
+    return added
+
+def _use_sqlite(file):
+    return STORAGE_BACKEND == "sqlite" and file in (ACTIVE_FILE, ARCHIVE_FILE)
+
+def _signature(file):
+    """(mtime, size) of the files behind `file`, used to detect outside changes."""
+    if _use_sqlite(file):
+        paths = (DB_FILE, DB_FILE + "-wal")
+    else:
+        paths = (file, journal_path(file))
+    sig = []
+    for path in paths:
         try:
-            return json.load(f)
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+def _remember(file, patients=None):
+    """Mark the resident copy as matching what is on disk after our own write."""
+    if patients is None:
+        if file not in _store:
+            return
+        patients = _store[file][1]
+    _store[file] = (_signature(file), patients)
+
+def backup_path(file, generation=1):
+    return f"{file}.bak{generation}"
+
+def _parse_json_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if not text.strip():
+        return []  # brand-new empty file
+    return json.loads(text)
+
+def _read_snapshot(file):
+    """
+    Read a snapshot file. If it is missing or corrupt (e.g. a crash during an
+    old-style write), fall back to the newest readable backup generation and
+    restore it, instead of silently starting from an empty list.
+    """
+    try:
+        return _parse_json_file(file)
+    except FileNotFoundError:
+        error = None
+    except (ValueError, UnicodeDecodeError) as e:
+        error = e
+    if not any(os.path.exists(backup_path(file, g)) for g in range(1, BACKUP_GENERATIONS + 1)):
+        if error is not None:
+            raise DataFileError(f"{file} is corrupt and no backup could be read: {error}")
+        return []  # no file and no backups yet
+    if held(file) == "shared":
+        raise _NeedsWriteLock(file)  # _read_locked reads again under the exclusive lock
+
+    with locked(file):
+        try:
+            return _parse_json_file(file)  # another terminal may have written it meanwhile
+        except FileNotFoundError:
+            error = None
+        except (ValueError, UnicodeDecodeError) as e:
+            error = e
+        for generation in range(1, BACKUP_GENERATIONS + 1):
+            backup = backup_path(file, generation)
+            try:
+                data = _parse_json_file(backup)
+            except (OSError, ValueError, UnicodeDecodeError):
+                continue
+            print(f"⚠️ {os.path.basename(file)} could not be read; restored it from {os.path.basename(backup)}.")
+            if error is not None:
+                # keep the damaged file around for inspection
+                os.replace(file, f"{file}.corrupt-{datetime.now():%Y%m%d%H%M%S}")
+            _atomic_write(file, json.dumps(data, indent=JSON_INDENT, separators=JSON_SEPARATORS,
+                                           ensure_ascii=False), rotate=False)
+            return data
+
+    if error is not None:
+        raise DataFileError(f"{file} is corrupt and no backup could be read: {error}")
+    return []
+
+def _fsync_dir(path):
+    """Make a rename durable (not possible/needed on Windows)."""
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _atomic_write(file, text, rotate=True):
+    """
+    Write text to a temp file, fsync it, then rename it over `file`.
+    A crash leaves either the old or the new file, never a half-written one.
+    With rotate, the previous file is kept as <file>.bak1 (older ones shift).
+    """
+    tmp = f"{file}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if rotate and os.path.exists(file):
+        for generation in range(BACKUP_GENERATIONS, 1, -1):
+            older = backup_path(file, generation - 1)
+            if os.path.exists(older):
+                os.replace(older, backup_path(file, generation))
+        os.replace(file, backup_path(file, 1))
+    os.replace(tmp, file)
+    _fsync_dir(file)
+
+def _read_journal(file, offset=0):
+    """
+    Journal entries from byte `offset` on, plus the offset just after the last
+    complete line (a line still being appended is read next time).
+    """
+    try:
+        with open(journal_path(file), "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line.decode("utf-8", errors="replace")))
         except json.JSONDecodeError:
-            return []
+            # half-written line (crash while appending) -> ignore it
+            continue
+    return entries, offset + end
+
+def _replay_journal(patients, entries):
+    """Apply journal entries on top of the snapshot list (in place)."""
+    if not entries:
+        return patients
+    position = {p.get("id"): i for i, p in enumerate(patients)}
+    removed = False
+    for entry in entries:
+        if entry.get("op") == "put":
+            patient = entry["patient"]
+            i = position.get(patient.get("id"))
+            if i is None:
+                position[patient.get("id")] = len(patients)
+                patients.append(patient)
+            else:
+                patients[i] = patient
+        elif entry.get("op") == "del":
+            i = position.pop(entry.get("id"), None)
+            if i is not None:
+                patients[i] = None  # dropped below, keeps positions valid
+                removed = True
+    if removed:
+        patients[:] = [p for p in patients if p is not None]
+    return patients
+
+def _snapshot_signature(file):
+    """Identity of the snapshot file; it changes whenever a process rewrites it."""
+    try:
+        st = os.stat(file)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _read_snapshot_records(file):
+    """The snapshot as records: from the binary cache when it matches, else parsed (and cached)."""
+    use_cache = SNAPSHOT_CACHE and file == ACTIVE_FILE
+    if use_cache:
+        patients = snapshot_cache.read_cache(file, _snapshot_signature(file))
+        if patients is not None:
+            return patients
+    patients = to_patients(_read_snapshot(file))
+    if use_cache:
+        snapshot_cache.write_cache(file, _snapshot_signature(file), patients)
+    return patients
+
+def _read_locked(file, read):
+    """
+    Run read() under the shared lock. A read that has to repair the file
+    (restore a backup, add missing ids) raises _NeedsWriteLock; the outermost
+    reader then runs read() again from the start under the exclusive lock, so
+    nothing is written from data another terminal may have replaced meanwhile.
+    """
+    if held(file) is not None:
+        return read()  # nested: the outermost reader retries
+    try:
+        with locked(file, shared=True):
+            return read()
+    except _NeedsWriteLock:
+        with locked(file):
+            return read()
+
+def _read_all(file):
+    """Snapshot plus journal as records; remembers how far the journal was read."""
+    def read():
+        patients = _read_snapshot_records(file)
+        entries, offset = _read_journal(file)
+        _positions[file] = (_snapshot_signature(file), offset)
+        return patients, entries
+    patients, entries = _read_locked(file, read)
+    return to_patients(_replay_journal(patients, entries))
+
+def load_json(file):
+    """Read a JSON snapshot plus its journal (no caching)."""
+    def read():
+        patients = _read_all(file)
+        if ensure_ids(patients):
+            # one-time migration of old files without ids
+            if held(file) != "exclusive":
+                raise _NeedsWriteLock(file)
+            _write_json(patients, file)
+        return patients
+    return _read_locked(file, read)
+
+def load_data(file=ACTIVE_FILE):
+    """
+    Load patient data: JSON snapshot plus any journaled changes (or the
+    matching rows of the SQLite database).
+    Returns the resident list unless the files changed on disk since last time;
+    changes other terminals journaled are then applied to it in place.
+    """
+    cached = _store.get(file)
+    if cached and cached[0] == _signature(file):
+        return cached[1]
+    if _use_sqlite(file):
+        # signature first: a write that lands during the read makes the next call reload
+        signature = _signature(file)
+        patients = to_patients(sqlite_store.load_patients(DB_FILE, active=(file == ACTIVE_FILE)))
+        _store[file] = (signature, patients)
+        return patients
+    def read():
+        if cached:
+            patients = cached[1]
+            _sync(file, patients)
+        else:
+            patients = load_json(file)
+        _remember(file, patients)
+        return patients
+    return _read_locked(file, read)
+
+def _sync(file, patients, committing=()):
+    """
+    Bring the resident list up to date with what other processes saved, in place.
+    Normally only journal lines past our last read offset are parsed. If the
+    snapshot was rewritten (another terminal compacted or archived), the file
+    is re-read and patients whose version differs are updated.
+    Raises ConflictError when a patient in `committing` was saved elsewhere
+    since it was read; all of those are then reset to what is on disk.
+    """
+    known = _positions.get(file)
+    by_id = {p.id: p for p in patients}
+    updated = {}
+    removed = {}
+    disk_versions = {}  # id -> version saved by someone else (None = deleted)
+
+    if known is not None and known[0] == _snapshot_signature(file):
+        entries, offset = _read_journal(file, known[1])
+        _positions[file] = (known[0], offset)
+        for entry in entries:
+            if entry.get("op") == "put":
+                record = Patient.from_dict(entry["patient"])
+                disk_versions[record.id] = record.version
+                current = by_id.get(record.id)
+                if current is None:
+                    patients.append(record)
+                    by_id[record.id] = record
+                    removed.pop(record.id, None)
+                    updated[record.id] = record
+                else:
+                    current.assign(record)
+                    updated[current.id] = current
+            elif entry.get("op") == "del":
+                disk_versions[entry.get("id")] = None
+                current = by_id.pop(entry.get("id"), None)
+                if current is not None:
+                    updated.pop(current.id, None)
+                    removed[current.id] = current
+    else:
+        fresh = _read_all(file)
+        fresh_ids = set()
+        for record in fresh:
+            fresh_ids.add(record.id)
+            current = by_id.get(record.id)
+            if current is None:
+                patients.append(record)
+                by_id[record.id] = record
+                updated[record.id] = record
+            elif current.get("version", 0) != record.version:
+                disk_versions[record.id] = record.version
+                current.assign(record)
+                updated[current.id] = current
+        # created in this commit (never saved): not on disk yet, and that's fine
+        pending = {p.id for p in committing if not p.get("version", 0)}
+        for pid in list(by_id):
+            if pid not in fresh_ids and pid not in pending:
+                disk_versions[pid] = None  # deleted elsewhere (merged, archived): a conflict if committing
+                removed[pid] = by_id.pop(pid)
+
+    conflicts = [p for p in committing if p.id in disk_versions]
+    if conflicts:
+        # reset everything in the rejected commit to its saved state
+        on_disk = {r.id: r for r in _read_all(file)}
+        for p in committing:
+            if p.id in on_disk:
+                p.assign(on_disk[p.id])
+                if by_id.get(p.id) is p:
+                    updated[p.id] = p
+            elif by_id.pop(p.id, None) is not None:
+                removed[p.id] = p  # created in this commit, never saved
+
+    if removed:
+        patients[:] = [p for p in patients if p.id not in removed]
+    changes = _outside_changes.setdefault(file, ({}, {}))
+    for pid in removed:
+        changes[0].pop(pid, None)
+    changes[0].update(updated)
+    changes[1].update(removed)
+    if conflicts:
+        raise ConflictError(conflicts)
+
+def take_outside_changes(file=ACTIVE_FILE):
+    """(updated, removed) patients changed by other terminals since the last call."""
+    updated, removed = _outside_changes.pop(file, ({}, {}))
+    return list(updated.values()), list(removed.values())
 
 def save_data(patients, file=ACTIVE_FILE):
-    """Save patient data to JSON file."""
-    with open(file, "w", encoding="utf-8") as f:
-        json.dump(patients, f, indent=4, ensure_ascii=False)
+    """Save the full patient list to JSON file (replaces the journal)."""
+    ensure_ids(patients)
+    if _use_sqlite(file):
+        sqlite_store.replace_patients(DB_FILE, patients, active=(file == ACTIVE_FILE))
+        _remember(file, patients)
+        return
+    with locked(file):
+        _write_json(patients, file)
+        _remember(file, patients)
+
+def _write_json(patients, file):
+    old_histories = []
+    if file == ACTIVE_FILE:
+        # procedure histories go to the history store; the snapshot keeps summaries
+        patients = to_patients(patients)
+        old_histories = history_store.store_histories(file, patients, _load_histories)
+        default = to_stored_json
+    else:
+        default = to_json
+    _atomic_write(file, json.dumps(patients, indent=JSON_INDENT, separators=JSON_SEPARATORS,
+                                   ensure_ascii=False, default=default))
+    if SNAPSHOT_CACHE and file == ACTIVE_FILE:
+        snapshot_cache.write_cache(file, _snapshot_signature(file), patients)
+    # only drop the journal once the new snapshot is safely in place
+    jfile = journal_path(file)
+    if os.path.exists(jfile):
+        os.remove(jfile)
+    _positions[file] = (_snapshot_signature(file), 0)
+    history_store.remove_generations(file, old_histories)
+
+def _load_histories(patients):
+    """
+    Fetch stored procedure lists (Patient.history_loader). A record that
+    points to a history another terminal has since moved is looked up again
+    in the current snapshot and journal.
+    """
+    def read():
+        missing = history_store.read_histories(ACTIVE_FILE, patients)
+        if not missing:
+            return [], {}, set()
+        snapshot = _read_snapshot(ACTIVE_FILE)
+        entries, _ = _read_journal(ACTIVE_FILE)
+        current = {r.id: r for r in to_patients(_replay_journal(snapshot, entries))}
+        stored = [current[p.id] for p in missing if p.id in current and not current[p.id].procedures_loaded()]
+        lost = {r.id for r in history_store.read_histories(ACTIVE_FILE, stored)}
+        return missing, current, lost
+    missing, current, lost = _read_locked(ACTIVE_FILE, read)
+    for p in missing:
+        record = current.get(p.id)
+        if record is None or record.id in lost:
+            print(f"⚠️ The procedure history of {p.firstName} {p.lastName} could not be read.")
+            p.procedure = []
+        else:
+            p.procedure = record.procedure
+            p._history = record._history
+
+Patient.history_loader = staticmethod(_load_histories)
+
+def _append_journal(jfile, text):
+    """Append lines to the journal and fsync them before returning."""
+    data = text.encode("utf-8")
+    with open(jfile, "ab") as f:
+        if f.tell() > 0:
+            # a crash mid-append can leave a torn last line; never glue onto it
+            with open(jfile, "rb") as r:
+                r.seek(-1, os.SEEK_END)
+                if r.read(1) != b"\n":
+                    data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def record_change(patient, file=ACTIVE_FILE):
+    """
+    Append one created/edited patient to the journal instead of rewriting
+    the whole file (SQLite: update just that patient's rows).
+    Cost depends on the size of the patient, not the database.
+    """
+    record_changes([patient], file)
+
+def record_changes(patients, file=ACTIVE_FILE, removed=()):
+    """
+    Journal several created/edited (and deleted) patients with a single write.
+    Compare-and-swap: each patient's version must still be the one on disk,
+    otherwise nothing is written and ConflictError is raised. Written
+    patients get version + 1.
+    """
+    patients = list(patients)
+    removed = list(removed)
+    for p in patients:
+        if not p.get("id"):
+            p["id"] = new_patient_id()
+    if _use_sqlite(file):
+        expected = {p["id"]: p.get("version", 0) for p in patients + removed}
+        for p in patients:
+            p["version"] = expected[p["id"]] + 1
+        stale = sqlite_store.upsert_patients(DB_FILE, patients, [p["id"] for p in removed], expected)
+        if stale:
+            for p in patients:
+                p["version"] = expected[p["id"]]
+            _store.pop(file, None)  # reload everything on the next load_data
+            raise ConflictError([p for p in patients + removed if p["id"] in stale])
+        _remember(file)
+        return
+
+    jfile = journal_path(file)
+    with locked(file):
+        cached = _store.get(file)
+        if cached is not None:
+            _sync(file, cached[1], committing=patients + removed)
+        for p in patients:
+            p["version"] = p.get("version", 0) + 1
+            if p.procedures_loaded():
+                p.drop_history()  # may have been edited: journaled in full, stored again on compaction
+        lines = "".join(
+            json.dumps({"op": "put", "patient": p}, ensure_ascii=False, default=to_stored_json) + "\n"
+            for p in patients
+        ) + "".join(json.dumps({"op": "del", "id": p["id"]}) + "\n" for p in removed)
+        _append_journal(jfile, lines)
+        _positions[file] = (_snapshot_signature(file), os.path.getsize(jfile))
+        _remember(file)
+        if os.path.getsize(jfile) > JOURNAL_COMPACT_BYTES:
+            compact_journal(file)
+
+def record_removal(patients, file=ACTIVE_FILE):
+    """Journal that patients were deleted (e.g. merged into another record)."""
+    record_changes([], file, removed=patients)
+
+def compact_journal(file=ACTIVE_FILE):
+    """Fold the journal into the snapshot file (run on exit / when it gets big)."""
+    if _use_sqlite(file):
+        sqlite_store.checkpoint(DB_FILE)
+        _remember(file)
+        return
+    with locked(file):
+        if os.path.exists(journal_path(file)):
+            save_data(load_data(file), file)
 
 def auto_archive_inactive(patients):
     """
     Move patients not updated for 3 months to archive.
     Returns the active list after moving old records to archive file.
+    Files are only written when at least one patient was moved.
     """
-    active = []
-    archived = load_data(ARCHIVE_FILE)
+    global _last_archive_day
     today = date.today()
+    _last_archive_day = today
 
-    for p in patients:
-        # If lastUpdated missing, treat as today to avoid accidental archiving
-        last_str = p.get("lastUpdated", date.today().isoformat())
-        try:
-            last_updated = datetime.strptime(last_str, "%Y-%m-%d").date()
-        except Exception:
-            # try fallback format with time, else use today
-            try:
-                last_updated = datetime.strptime(last_str, "%Y-%m-%d %H:%M:%S").date()
-            except Exception:
-                last_updated = today
+    if _use_sqlite(ACTIVE_FILE):
+        # archiving is a single UPDATE; reload the active rows only if any moved
+        cutoff = (today - timedelta(days=INACTIVE_DAYS)).isoformat()
+        if not sqlite_store.archive_before(DB_FILE, cutoff):
+            return patients
+        _store.pop(ACTIVE_FILE, None)
+        return load_data(ACTIVE_FILE)
+
+    with locked(ACTIVE_FILE):
+        # apply other terminals' edits to the resident list first,
+        # so the rewrite below doesn't drop them
+        load_data(ACTIVE_FILE)
+        return _archive_sweep(patients, today)
 
-        if today - last_updated > timedelta(days=90) or not p.get("isActive", True):
+def split_inactive(patients, today):
+    """
+    (active, moved): patients not updated for 90 days (or already marked
+    inactive) are moved and flagged isActive = False.
+    """
+    cutoff = today.toordinal() - INACTIVE_DAYS
+    active = []
+    moved = []
+    for p in patients:
+        # If lastUpdated missing/invalid, treat as today to avoid accidental archiving
+        last_updated = parse_ordinal(p.get("lastUpdated"))
+        if (last_updated is not None and last_updated < cutoff) or not p.get("isActive", True):
             p["isActive"] = False
-            archived.append(p)
+            moved.append(p)
         else:
             active.append(p)
+    return active, moved
+
+def _archive_sweep(patients, today):
+    active, moved = split_inactive(patients, today)
+    if not moved:
+        return patients
 
+    # archive first: a crash before the active save leaves a duplicate, not a loss
+    archive_patients(moved)
     save_data(active, ACTIVE_FILE)
-    save_data(archived, ARCHIVE_FILE)
     return active
+
+def archive_patients(moved):
+    """Add patients to the archive (appended to this month's segment; nothing is rewritten)."""
+    for p in moved:
+        p["isActive"] = False
+    if _use_sqlite(ARCHIVE_FILE):
+        sqlite_store.upsert_patients(DB_FILE, moved)
+        _store.pop(ARCHIVE_FILE, None)
+        return
+    # patients only move active -> archive, so the active file's lock covers the segments
+    with locked(ACTIVE_FILE):
+        load_histories(moved)  # archived records carry their full history
+        archive_store.append_archived(moved, ARCHIVE_DIR)
+
+def iter_archived():
+    """Stream archived patients without loading the whole archive."""
+    if _use_sqlite(ARCHIVE_FILE):
+        return iter(load_data(ARCHIVE_FILE))
+    archive_store.migrate_legacy(ARCHIVE_FILE, ARCHIVE_DIR, load_json, _write_json)
+    return archive_store.iter_archived(ARCHIVE_DIR)
+
+def auto_archive_if_due(patients):
+    """Run auto_archive_inactive once per day; otherwise return patients unchanged."""
+    if _last_archive_day == date.today():
+        return patients
+    return auto_archive_inactive(patients)
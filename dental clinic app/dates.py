@@ -0,0 +1,61 @@
+# dates.py
+# Fast date handling. Dates are stored as "YYYY-MM-DD" strings but compared as
+# day ordinals (date.toordinal()). The canonical form is parsed by slicing,
+# with no strptime, and every distinct string is parsed only once: a patient
+# list holds a few thousand distinct dates, so the cache turns the archive sweep
+# and the schedule/filter code into dict lookups.
+from datetime import date
+
+MAX_CACHE = 100_000  # distinct date strings remembered (cleared when full)
+
+_cache = {}
+
+
+def _parse(text):
+    text = text.strip()
+    # fast path: canonical YYYY-MM-DD (optionally followed by " HH:MM:SS")
+    if len(text) >= 10 and text[4] == "-" and text[7] == "-" and (len(text) == 10 or text[10] == " "):
+        y, m, d = text[:4], text[5:7], text[8:10]
+        if y.isdigit() and m.isdigit() and d.isdigit():
+            try:
+                return date(int(y), int(m), int(d)).toordinal()
+            except ValueError:
+                return None
+    # old records: months/days without zero padding ("2025-3-7"), as strptime allowed
+    parts = text.split(" ", 1)[0].split("-")
+    if (len(parts) == 3 and len(parts[0]) == 4 and len(parts[1]) <= 2 and len(parts[2]) <= 2
+            and all(p.isdigit() for p in parts)):
+        try:
+            return date(int(parts[0]), int(parts[1]), int(parts[2])).toordinal()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_ordinal(text):
+    """Day ordinal of a YYYY-MM-DD date (a trailing time is ignored); None if blank/invalid."""
+    if not text or not isinstance(text, str):
+        return None
+    try:
+        return _cache[text]
+    except KeyError:
+        pass
+    if len(_cache) >= MAX_CACHE:
+        _cache.clear()
+    ordinal = _cache[text] = _parse(text)
+    return ordinal
+
+
+def is_valid_date(text):
+    """True for a plain date (no time part), like strptime(text, "%Y-%m-%d")."""
+    return isinstance(text, str) and " " not in text and parse_ordinal(text) is not None
+
+
+def normalize_date(text):
+    """Zero-padded YYYY-MM-DD for a valid date, else None."""
+    ordinal = parse_ordinal(text)
+    return None if ordinal is None else date.fromordinal(ordinal).isoformat()
+
+
+def today_ordinal():
+    return date.today().toordinal()
@@ -0,0 +1,211 @@
+# dedup.py
+# Duplicate patient detection. Patients are grouped by blocking keys (same
+# normalized contact, or same birthday + last-name soundex) and only pairs
+# inside a block are scored, so a full scan is about O(N) instead of O(N²)
+# and checking one new patient is a couple of dict lookups.
+#
+# Usage: python dedup.py            list likely duplicates
+#        python dedup.py --merge    ...and ask to merge each pair
+import sys
+from difflib import SequenceMatcher
+from itertools import combinations
+
+# score weights: a (near) identical name plus either a shared contact or a shared
+# birthday reaches DUPLICATE_SCORE, so both kinds of block can report a pair
+NAME_WEIGHT, CONTACT_WEIGHT, BDAY_WEIGHT = 0.6, 0.2, 0.2
+DUPLICATE_SCORE = 0.75  # pairs scoring at least this are reported
+MAX_BLOCK = 50          # larger blocks (e.g. a shared clinic number) are not paired
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"), "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def soundex(name):
+    """American soundex code of a name ("" for a name without letters)."""
+    letters = [c for c in (name or "").lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    last = _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in "hw":  # h/w don't separate equal codes, vowels do
+            last = digit
+    return code.ljust(4, "0")
+
+
+def normalize_contact(contact):
+    """Digits only, with +63/63 country prefixes written as the local 09... form."""
+    digits = "".join(c for c in (contact or "") if c.isdigit())
+    if digits.startswith("63") and len(digits) == 12:
+        digits = "0" + digits[2:]
+    return digits
+
+
+def blocking_keys(patient):
+    """Keys that any likely duplicate of this patient shares with it."""
+    keys = []
+    contact = normalize_contact(patient.get("contact"))
+    if contact:
+        keys.append(("contact", contact))
+    bday = (patient.get("bday") or "").strip()
+    if bday:
+        keys.append(("bday", bday, soundex(patient.get("lastName"))))
+    return keys
+
+
+def _full_name(patient):
+    return f"{patient.get('firstName', '')} {patient.get('lastName', '')}".strip().lower()
+
+
+def score(a, b):
+    """0..1 likelihood that two patients are the same person."""
+    names = SequenceMatcher(None, _full_name(a), _full_name(b)).ratio()
+    contact = normalize_contact(a.get("contact"))
+    same_contact = bool(contact) and contact == normalize_contact(b.get("contact"))
+    same_bday = bool(a.get("bday")) and a.get("bday") == b.get("bday")
+    return round(NAME_WEIGHT * names + CONTACT_WEIGHT * same_contact + BDAY_WEIGHT * same_bday, 3)
+
+
+class DedupIndex:
+    """Blocking key -> ids of the patients that have it."""
+
+    def __init__(self):
+        self.source = None   # patient list this index was built from
+        self.by_id = {}      # id -> patient
+        self.keys = {}       # id -> blocking keys as they were indexed
+        self.blocks = {}     # blocking key -> [ids]
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        for p in patients:
+            self.add(p)
+
+    def add(self, patient):
+        pid = patient.get("id")
+        self.by_id[pid] = patient
+        self.keys[pid] = blocking_keys(patient)
+        for key in self.keys[pid]:
+            self.blocks.setdefault(key, []).append(pid)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        self.by_id.pop(pid, None)
+        for key in self.keys.pop(pid, ()):
+            ids = self.blocks.get(key, [])
+            if pid in ids:
+                ids.remove(pid)
+            if not ids:
+                self.blocks.pop(key, None)
+
+    def update(self, patient):
+        self.remove(patient)
+        self.add(patient)
+
+    def matches(self, patient, threshold=DUPLICATE_SCORE):
+        """[(score, other patient)] for indexed patients that look like `patient`, best first."""
+        seen = {patient.get("id")}
+        found = []
+        for key in blocking_keys(patient):
+            ids = self.blocks.get(key, ())
+            if len(ids) > MAX_BLOCK:
+                continue
+            for pid in ids:
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                s = score(patient, self.by_id[pid])
+                if s >= threshold:
+                    found.append((s, self.by_id[pid]))
+        found.sort(key=lambda item: -item[0])
+        return found
+
+    def pairs(self, threshold=DUPLICATE_SCORE):
+        """[(score, a, b)] for every likely duplicate pair, best first."""
+        checked = set()
+        found = []
+        for ids in self.blocks.values():
+            if len(ids) < 2 or len(ids) > MAX_BLOCK:
+                continue
+            for x, y in combinations(ids, 2):
+                pair = (x, y) if x < y else (y, x)
+                if pair in checked:
+                    continue  # same pair met through its other key
+                checked.add(pair)
+                s = score(self.by_id[x], self.by_id[y])
+                if s >= threshold:
+                    found.append((s, self.by_id[x], self.by_id[y]))
+        found.sort(key=lambda item: -item[0])
+        return found
+
+
+_index = DedupIndex()
+
+
+def get_dedup_index(patients):
+    """Return the shared index for this patient list, building it if needed."""
+    if _index.source is not patients or len(_index.by_id) != len(patients):
+        _index.build(patients)
+    return _index
+
+
+def find_duplicates(patients, threshold=DUPLICATE_SCORE):
+    return get_dedup_index(patients).pairs(threshold)
+
+
+def possible_duplicates(patients, patient, threshold=DUPLICATE_SCORE):
+    """Existing patients that look like `patient` (which need not be in the list yet)."""
+    return get_dedup_index(patients).matches(patient, threshold)
+
+
+def dedup_patient(patients, patient):
+    """Add or re-index one patient after create/update."""
+    if _index.source is patients:
+        _index.update(patient)
+    else:
+        _index.build(patients)
+
+
+def undedup_patient(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _index.source is patients:
+        _index.remove(patient)
+
+
+def _describe(p):
+    return f"{p.firstName} {p.lastName} | bday {p.bday or '-'} | {p.contact} | balance ₱{p.balance}"
+
+
+def main():
+    import clinic_service as service
+    from data_handler import load_data
+
+    merge = "--merge" in sys.argv[1:]
+    patients = load_data()
+    pairs = find_duplicates(patients)
+    if not pairs:
+        print("✅ No likely duplicate patients found.")
+        return
+    print(f"Found {len(pairs)} likely duplicate pair(s):")
+    merged = set()
+    for n, (s, a, b) in enumerate(pairs, 1):
+        print(f"\n{n}. score {s:.2f}")
+        print(f"   A: {_describe(a)}")
+        print(f"   B: {_describe(b)}")
+        if not merge or a.id in merged or b.id in merged:
+            continue
+        if input("Merge B into A? (y/n): ").strip().lower() == "y":
+            service.merge_patients(patients, a, b)
+            merged.add(b.id)
+            print("✅ Merged.")
+
+
+if __name__ == "__main__":
+    main()
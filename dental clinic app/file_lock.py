@@ -0,0 +1,82 @@
+# file_lock.py
+# Advisory cross-process lock on "<file>.lock", so several terminals running
+# the app against the same data files don't interleave their writes.
+# fcntl.flock on Linux/macOS; msvcrt on Windows (exclusive only there).
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# lock file -> [fd, shared?, depth]; nested locked() calls in one process reuse it
+_held = {}
+
+
+def _acquire(fd, shared):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)  # gives up after ~10s, so retry
+                return
+            except OSError:
+                continue
+
+
+def _release(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def held(file):
+    """"shared" or "exclusive" if this process holds the lock for `file`, else None."""
+    entry = _held.get(file + ".lock")
+    if entry is None:
+        return None
+    return "shared" if entry[1] else "exclusive"
+
+
+@contextmanager
+def locked(file, shared=False):
+    """
+    Hold the lock for `file` (shared = readers only) until the block ends.
+    Re-entrant, but a shared lock is never upgraded: flock would drop it
+    before taking the exclusive one, and another process could write in
+    between. Code that may have to write after reading takes the exclusive
+    lock before it reads.
+    """
+    path = file + ".lock"
+    entry = _held.get(path)
+    if entry is not None:
+        if entry[1] and not shared and fcntl is not None:
+            raise RuntimeError(f"exclusive lock on {file} requested while holding a shared one")
+        entry[2] += 1
+        try:
+            yield
+        finally:
+            entry[2] -= 1
+        return
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _acquire(fd, shared)
+    except BaseException:
+        os.close(fd)
+        raise
+    _held[path] = [fd, shared, 1]
+    try:
+        yield
+    finally:
+        del _held[path]
+        try:
+            _release(fd)
+        finally:
+            os.close(fd)
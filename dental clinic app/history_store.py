@@ -0,0 +1,123 @@
+# history_store.py
+# Procedure histories kept out of the active snapshot. Each history is one
+# JSON line ({"id": ..., "procedure": [...]}) in an append-only file next to
+# the snapshot (active_patients.history1, .history2, ...). The snapshot only
+# stores each patient's summary (count, billed, paid) and where its line is
+# (file generation, offset, length), so startup doesn't parse or keep every
+# procedure. A history is fetched with one seek + read when it is needed.
+#
+# Histories are appended when a snapshot is written, for patients whose list
+# may have changed since it was last stored. Once most of the bytes are old
+# versions, the live histories are copied into a new generation; older files
+# are kept for a while so backups and other terminals can still read them.
+import json
+import os
+
+from records import Procedure, to_json
+
+HISTORY_SUFFIX = ".history"
+COMPACT_MIN_DEAD_BYTES = 4 * 1024 * 1024  # rewrite once this much is stale (and more than half)
+KEEP_OLD_GENERATIONS = 2                  # like BACKUP_GENERATIONS: .bak snapshots may point there
+
+
+def history_path(snapshot_file, generation):
+    return f"{os.path.splitext(snapshot_file)[0]}{HISTORY_SUFFIX}{generation}"
+
+
+def generations(snapshot_file):
+    """Existing history file generations, oldest first."""
+    base = os.path.basename(os.path.splitext(snapshot_file)[0]) + HISTORY_SUFFIX
+    folder = os.path.dirname(os.path.abspath(snapshot_file))
+    found = []
+    for name in os.listdir(folder):
+        if name.startswith(base) and name[len(base):].isdigit():
+            found.append(int(name[len(base):]))
+    return sorted(found)
+
+
+def _append(path, patients):
+    """Append the patients' histories to one file (fsynced) and remember where they went."""
+    lines = [
+        (json.dumps({"id": p.id, "procedure": p.procedure}, ensure_ascii=False, default=to_json) + "\n")
+        .encode("utf-8")
+        for p in patients
+    ]
+    with open(path, "ab") as f:
+        offset = f.tell()
+        f.write(b"".join(lines))
+        f.flush()
+        os.fsync(f.fileno())
+    generation = int(path[path.rindex(HISTORY_SUFFIX) + len(HISTORY_SUFFIX):])
+    for p, line in zip(patients, lines):
+        p.set_history((generation, offset, len(line)))
+        offset += len(line)
+
+
+def store_histories(snapshot_file, patients, load):
+    """
+    Make sure every patient's history is in the store before the snapshot
+    that points to it is written. `load` fetches stored histories (used when
+    the store is compacted). Returns the generations that may be deleted
+    once the new snapshot is in place.
+    """
+    existing = generations(snapshot_file)
+    current = existing[-1] if existing else 1
+    changed = [p for p in patients if p.history_ref() is None]
+    if changed:
+        _append(history_path(snapshot_file, current), changed)
+
+    # live histories are all in the newest file (a compaction moves every one of them)
+    stored = os.path.getsize(history_path(snapshot_file, current)) if changed or existing else 0
+    live = sum(ref[2] for ref in (p.history_ref() for p in patients) if ref[0] == current)
+    dead = stored - live
+    if dead < COMPACT_MIN_DEAD_BYTES or dead < live:
+        return []
+
+    # copy the live histories into a fresh generation; lists fetched only for this are dropped again
+    fetched = [p for p in patients if not p.procedures_loaded()]
+    load(fetched)
+    _append(history_path(snapshot_file, current + 1), patients)
+    for p in fetched:
+        del p.procedure
+    return [g for g in generations(snapshot_file) if g <= current - KEEP_OLD_GENERATIONS]
+
+
+def remove_generations(snapshot_file, old):
+    for generation in old:
+        try:
+            os.remove(history_path(snapshot_file, generation))
+        except FileNotFoundError:
+            pass
+
+
+def read_histories(snapshot_file, patients):
+    """
+    Fill in the stored procedure lists (in file order, one open file per
+    generation). Returns the patients whose entry was not where their record
+    says (the store was compacted by another terminal meanwhile).
+    """
+    missing = []
+    by_file = {}
+    for p in patients:
+        by_file.setdefault(p.history_ref()[0], []).append(p)
+    from_dict = Procedure.from_dict
+    for generation, group in by_file.items():
+        group.sort(key=lambda p: p.history_ref()[1])
+        try:
+            f = open(history_path(snapshot_file, generation), "rb")
+        except FileNotFoundError:
+            missing.extend(group)
+            continue
+        with f:
+            for p in group:
+                _, offset, length = p.history_ref()
+                f.seek(offset)
+                try:
+                    entry = json.loads(f.read(length))
+                except ValueError:
+                    entry = None
+                if not entry or entry.get("id") != p.id:
+                    missing.append(p)
+                    continue
+                p.procedure = [from_dict(pr) for pr in entry["procedure"]]
+    return missing
@@ -1,9 +1,11 @@
 # main.py
-from data_handler import load_data, auto_archive_inactive, save_data, ARCHIVE_FILE
+from data_handler import (
+    load_data, auto_archive_inactive, auto_archive_if_due, compact_journal, iter_archived, DataFileError
+)
 from patient_ops import (
-    create_patient, update_patient, view_patients, view_balance_stats, view_schedule, dashboard
+    create_patient, update_patient, view_patients, view_balance_stats, view_schedule, view_reports, dashboard
 )
-from data_handler import load_data as load_from_file
+from clinic_service import sync
 
 import os
 import sys
@@ -69,7 +71,13 @@ def main():
 
     #cinematic_intro()
 
-    patients = load_data()
+    try:
+        patients = load_data()
+    except DataFileError as e:
+        # never start on an empty list: the next save would wipe the records
+        print(f"❌ {e}")
+        print("Restore the file (or a .bak copy next to it) and start the app again.")
+        return
     patients = auto_archive_inactive(patients)
 
     while True:
@@ -82,9 +90,10 @@ def main():
 4. View Archived Patients
 5. View Floating Balance Stats
 6. View Incoming Schedules
-7. Exit
+7. Clinic Reports
+8. Exit
 """)
-        choice = input("Enter choice (1-7): ").strip()
+        choice = input("Enter choice (1-8): ").strip()
 
         if choice == "1":
             create_patient(patients)
@@ -93,8 +102,8 @@ def main():
         elif choice == "3":
             view_patients(patients, show_active=True)
         elif choice == "4":
-            archived = load_from_file(ARCHIVE_FILE)
-            view_patients(archived, show_active=False)
+            # archive segments are streamed a page at a time, not loaded all at once
+            view_patients(iter_archived, show_active=False)
         # elif choice == "5":
         #     archive_patient(patients)
         elif choice == "5":
@@ -102,15 +111,18 @@ def main():
         elif choice == "6":
             view_schedule(patients)
         elif choice == "7":
+            view_reports(patients)
+        elif choice == "8":
             print("👋 Exiting program... Goodbye!")
-            save_data(patients)  # ensure final save
+            compact_journal()  # fold this session's journal into the snapshot
             break
         else:
             print("❌ Invalid choice. Try again.\n")
 
-        # refresh and auto-archive on loop
-        patients = load_data()
-        patients = auto_archive_inactive(patients)
+        # pick up other terminals' saves (stat check, then only their new journal lines)
+        # and archive once per day
+        patients = sync(patients)
+        patients = auto_archive_if_due(patients)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,199 @@
+# patient_index.py
+# In-memory lookup index for patients. Built once from the loaded list and
+# kept up to date by patient_ops on create/update, so searches don't scan.
+
+GRAM_SIZE = 3  # names are split into 1..3 letter grams for substring search
+
+
+def _grams(text):
+    """All substrings of length 1..GRAM_SIZE in text."""
+    out = set()
+    for n in range(1, GRAM_SIZE + 1):
+        for i in range(len(text) - n + 1):
+            out.add(text[i:i + n])
+    return out
+
+
+class PatientIndex:
+    """
+    Prefix trie + n-gram index over names and an exact index on contact.
+    The trie and grams hold distinct lowercase names (many patients share a
+    name), and each name maps to the ids of the patients that carry it.
+    """
+
+    def __init__(self):
+        self.source = None   # patient list this index was built from
+        self.by_id = {}      # id -> patient
+        self.order = {}      # id -> insertion number (keeps list order in results)
+        self.keys = {}       # id -> (names, contact) as they were indexed
+        self.names = {}      # lowercase name -> ids
+        self.trie = {}       # char -> child node, node["$"] = names with this prefix
+        self.grams = {}      # gram -> names containing it
+        self.contacts = {}   # contact -> ids
+        self._seq = 0
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        for p in patients:
+            self.add(p)
+
+    def _add_name(self, name):
+        node = self.trie
+        for ch in name:
+            node = node.setdefault(ch, {})
+            node.setdefault("$", set()).add(name)
+        for g in _grams(name):
+            self.grams.setdefault(g, set()).add(name)
+
+    def _drop_name(self, name):
+        node = self.trie
+        for ch in name:
+            node = node.get(ch)
+            if node is None:
+                break
+            node["$"].discard(name)
+        for g in _grams(name):
+            names = self.grams.get(g)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.grams[g]
+
+    def add(self, patient):
+        pid = patient.get("id")
+        if pid in self.by_id:
+            self.remove(patient)
+        names = tuple({
+            patient.get("firstName", "").lower(),
+            patient.get("lastName", "").lower(),
+        } - {""})
+        contact = patient.get("contact", "")
+        self.by_id[pid] = patient
+        self.order[pid] = self._seq
+        self._seq += 1
+        self.keys[pid] = (names, contact)
+
+        for name in names:
+            ids = self.names.get(name)
+            if ids is None:
+                ids = self.names[name] = set()
+                self._add_name(name)
+            ids.add(pid)
+        if contact:
+            self.contacts.setdefault(contact, set()).add(pid)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        if pid not in self.keys:
+            return
+        names, contact = self.keys.pop(pid)
+        self.by_id.pop(pid, None)
+        self.order.pop(pid, None)
+
+        for name in names:
+            ids = self.names.get(name)
+            if ids is None:
+                continue
+            ids.discard(pid)
+            if not ids:
+                del self.names[name]
+                self._drop_name(name)
+        ids = self.contacts.get(contact)
+        if ids is not None:
+            ids.discard(pid)
+            if not ids:
+                del self.contacts[contact]
+
+    def update(self, patient):
+        """Re-index a patient after its name or contact changed."""
+        seq = self.order.get(patient.get("id"))
+        self.remove(patient)
+        self.add(patient)
+        if seq is not None:
+            self.order[patient.get("id")] = seq  # keep its place in results
+
+    # ----------------- queries -----------------
+
+    def _patients(self, ids):
+        return [self.by_id[i] for i in sorted(ids, key=self.order.__getitem__)]
+
+    def _patients_named(self, names):
+        ids = set()
+        for name in names:
+            ids |= self.names[name]
+        return self._patients(ids)
+
+    def prefix(self, text):
+        """Patients whose first or last name starts with text."""
+        node = self.trie
+        for ch in text.lower():
+            node = node.get(ch)
+            if node is None:
+                return []
+        return self._patients_named(node.get("$", ()))
+
+    def substring(self, text):
+        """Patients whose first or last name contains text."""
+        text = text.lower()
+        if not text:
+            return self._patients(self.by_id)
+        if len(text) <= GRAM_SIZE:
+            return self._patients_named(self.grams.get(text, ()))
+
+        # intersect the grams of the query, smallest set first, then verify
+        sets = sorted(
+            (self.grams.get(text[i:i + GRAM_SIZE], set()) for i in range(len(text) - GRAM_SIZE + 1)),
+            key=len,
+        )
+        candidates = set(sets[0])
+        for s in sets[1:]:
+            if not candidates:
+                break
+            candidates &= s
+        return self._patients_named(n for n in candidates if text in n)
+
+    def contact(self, number):
+        """Patients with exactly this contact number."""
+        return self._patients(self.contacts.get(number.strip(), ()))
+
+
+_index = PatientIndex()
+
+
+def get_index(patients):
+    """Return the shared index for this patient list, building it if needed."""
+    if _index.source is not patients or len(_index.by_id) != len(patients):
+        _index.build(patients)
+    return _index
+
+
+def search_patients(patients, query, mode="auto"):
+    """
+    Shared patient lookup used by the CLI and batch tools.
+    mode: "prefix", "substring", "contact" or "auto"
+    (auto = contact lookup for digits, otherwise name substring).
+    """
+    index = get_index(patients)
+    query = query.strip()
+    if mode == "auto":
+        mode = "contact" if query.isdigit() else "substring"
+    if mode == "prefix":
+        return index.prefix(query)
+    if mode == "contact":
+        return index.contact(query)
+    return index.substring(query)
+
+
+def index_patient(patients, patient):
+    """Add or re-index one patient after create/update."""
+    if _index.source is patients:
+        _index.update(patient)
+    else:
+        _index.build(patients)
+
+
+def unindex_patient(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _index.source is patients:
+        _index.remove(patient)
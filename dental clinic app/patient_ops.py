@@ -1,18 +1,27 @@
 # patient_ops.py
-from datetime import date, datetime
-from data_handler import load_data, save_data, ARCHIVE_FILE
-from validation import validate_contact, validate_date_str
+from datetime import date
+from itertools import chain
+from data_handler import save_data, archive_patients, iter_archived
+from validation import validate_contact, validate_date_str, contact_error
+from patient_index import search_patients, unindex_patient
+from schedule_index import get_schedule_index, unindex_schedule
+from balance_ledger import get_ledger, unledger_patient
+from dedup import possible_duplicates
+from patient_pages import SORT_KEYS, make_filter, iter_pages, write_page
+from reports import ReportColumns, get_reports
+from scheduler import get_slot_index, unslot_patient, first_slot_from, slot_start, format_time
+import scheduler
+import clinic_service as service
 
 
 
-# Note: load_data/save_data come from data_handler and use default ACTIVE_FILE
+# Note: save_data comes from data_handler and uses the default ACTIVE_FILE.
+# Edits go through clinic_service, which journals the patient and updates the indexes.
+
 
 def find_patient(patients, name):
-    """Find patient(s) by partial name (case insensitive)."""
-    matches = [
-        p for p in patients
-        if name.lower() in p.get("firstName", "").lower() or name.lower() in p.get("lastName", "").lower()
-    ]
+    """Find patient(s) by partial name (case insensitive) or contact number."""
+    matches = search_patients(patients, name)
 
     if not matches:
         print("❌ No patient found with that name.")
@@ -21,7 +30,7 @@ def find_patient(patients, name):
     # Always show list to choose from (even if 1 match)
     print("\nMatching patients:")
     for i, p in enumerate(matches, 1):
-        print(f"{i}. {p.get('firstName','')} {p.get('lastName','')}")
+        print(f"{i}. {p.firstName} {p.lastName}")
     while True:
         try:
             choice = int(input("Select patient number: "))
@@ -43,49 +52,67 @@ def create_patient(patients):
         return
     contact = validate_contact()
 
-    new_patient = {
-        "firstName": first_name,
-        "lastName": last_name,
-        "bday": bday,
-        "contact": contact,
-        "balance": 0.0,
-        "schedule": "",
-        "scheduleStatus": False,  # means appointment pending
-        "procedure": [],            # store history as list of dicts
-        "status": "paid",
-        "isActive": True,
-        "lastUpdated": date.today().isoformat()
-    }
-
-    patients.append(new_patient)
-    save_data(patients)
+    # blocking-key lookup: only patients sharing the contact or bday + name sound are scored
+    candidate = {"firstName": first_name, "lastName": last_name, "bday": bday, "contact": contact}
+    similar = possible_duplicates(patients, candidate)
+    if similar:
+        print("\n⚠️ This looks like an existing patient:")
+        for s, p in similar[:5]:
+            print(f"  - {p.firstName} {p.lastName} (bday {p.bday or '-'}, contact {p.contact}) [match {s:.0%}]")
+        if input("Add as a new patient anyway? (y/n): ").strip().lower() != "y":
+            print("❌ Patient not added.\n")
+            return
+
+    service.create_patient(patients, first_name, last_name, bday, contact)
     print(f"\n✅ Patient '{first_name} {last_name}' added successfully!\n")
 
 
+def _ask_amount(prompt, apply):
+    """Prompt until apply(amount_text) accepts the input (service raises ValueError)."""
+    while True:
+        amount_input = input(prompt).strip()
+        if not amount_input:
+            print("❌ Amount cannot be empty.")
+            continue
+        try:
+            return apply(amount_input)
+        except service.ConflictError:
+            raise
+        except ValueError as e:
+            print(f"❌ {e}")
+
+
 def update_patient(patients):
     print("\n--- Update Patient Info ---")
-    name = input("Enter patient name to update: ")
+    name = input("Enter patient name or contact number to update: ")
     patient = find_patient(patients, name)
     if not patient:
         return
+    try:
+        _edit_patient(patients, patient)
+    except service.ConflictError as e:
+        # another terminal saved this patient first; back to the menu with fresh data
+        print(f"❌ {e}\n")
+
 
+def _edit_patient(patients, patient):
     while True:
-        print(f"\nEditing patient: {patient['firstName']} {patient['lastName']}")
-        print(f"Birthday: {patient.get('bday','')}")
-        print(f"Contact: {patient.get('contact','')}")
-        print(f"Balance: ₱{patient.get('balance',0.0)}")
-        print(f"Next Schedule: {patient.get('schedule','')}")
+        print(f"\nEditing patient: {patient.firstName} {patient.lastName}")
+        print(f"Birthday: {patient.bday}")
+        print(f"Contact: {patient.contact}")
+        print(f"Balance: ₱{patient.balance}")
+        print(f"Next Schedule: {_appointment_text(patient)}")
         print("Procedure History:")
 
         # Show procedure history properly
-        if isinstance(patient.get("procedure"), list) and patient["procedure"]:
-            for i, proc in enumerate(patient["procedure"], 1):
-                print(f"  {i}. {proc.get('name','')} - ₱{proc.get('amount',0)} ({proc.get('date','')})")
+        if isinstance(patient.procedure, list) and patient.procedure:
+            for i, proc in enumerate(patient.procedure, 1):
+                print(f"  {i}. {proc.name} - ₱{proc.amount} ({proc.date})")
         else:
             print("  No procedure history yet.")
 
-        print(f"Status: {patient.get('status','')}")
-        print(f"Active: {patient.get('isActive', True)}")
+        print(f"Status: {patient.status}")
+        print(f"Active: {patient.isActive}")
         print("\nChoose what to edit:")
         print("1. First Name")
         print("2. Last Name")
@@ -97,69 +124,65 @@ def update_patient(patients):
         print("7. Update Procedure")
         print("8. Settle Balance")
         print("9. Exit Update Mode")
-       
+
+        # Every edit below is saved right away by clinic_service (journaled)
         choice = input("Enter your choice (1-9): ").strip()
 
         if choice == "1":
-            patient["firstName"] = input("Enter new first name: ").strip()
+            service.update_info(patients, patient, first_name=input("Enter new first name: "))
             print("✅ First name updated!")
         elif choice == "2":
-            patient["lastName"] = input("Enter new last name: ").strip()
+            service.update_info(patients, patient, last_name=input("Enter new last name: "))
             print("✅ Last name updated!")
         elif choice == "3":
-            patient["contact"] = validate_contact()
+            service.update_info(patients, patient, contact=validate_contact())
             print("✅ Contact updated successfully!")
         # elif choice == "4":
         #     print("❌ You cannot directly edit balance. Please use 'Update Procedure / Add Payment' instead.")
         elif choice == "4":
             sched = input("Enter new appointment (YYYY-MM-DD): ").strip()
             if sched:
+                first = format_time(scheduler.OPEN_MINUTE)
+                last = format_time(scheduler.CLOSE_MINUTE - scheduler.SLOT_MINUTES)
+                slot_time = input(f"Time (HH:MM, {first}-{last}, Enter = first free slot): ").strip()
                 try:
-                    # Try parsing to a valid date
-                    parsed_date = datetime.strptime(sched, "%Y-%m-%d")
-                    # Always save as zero-padded format (YYYY-MM-DD)
-                    sched = parsed_date.strftime("%Y-%m-%d")
-                    patient["schedule"] = sched
-                    patient["scheduleStatus"] = False
-                    print(f"✅ Schedule updated to {sched}!")
-                except ValueError:
-                    print("❌ Invalid date format. Please use YYYY-MM-DD.")
+                    service.reschedule(patients, patient, sched, slot_time or None)
+                    print(f"✅ Schedule updated to {_appointment_text(patient)}!")
+                except service.ConflictError:
+                    raise
+                except ValueError as e:
+                    print(f"❌ {e}")
             else:
                 print("ℹ️ Schedule not changed.")
 
         elif choice == "5":
             print("\nLeave blank if you don’t want to change a field.")
-            fn = input(f"New first name ({patient['firstName']}): ").strip() or patient["firstName"]
-            ln = input(f"New last name ({patient['lastName']}): ").strip() or patient["lastName"]
+            fn = input(f"New first name ({patient.firstName}): ").strip() or patient.firstName
+            ln = input(f"New last name ({patient.lastName}): ").strip() or patient.lastName
             while True:
-                contact_input = input(f"New contact ({patient['contact']}): ").strip()
+                contact_input = input(f"New contact ({patient.contact}): ").strip()
                 if not contact_input:
                     # leave old contact unchanged
-                    contact_input = patient["contact"]
+                    contact_input = patient.contact
                     break
-                elif not contact_input.isdigit():
-                    print("❌ Contact number must contain only digits.")
-                elif len(contact_input) != 11:
-                    print("❌ Contact number must be exactly 11 digits.")
-                elif not contact_input.startswith("09"):
-                    print("❌ Contact number must start with '09'.")
+                error = contact_error(contact_input)
+                if error:
+                    print(f"❌ {error}")
                 else:
                     break  # ✅ valid input
-                   
-            # sched = input(f"New schedule ({patient.get('schedule','')}): ").strip() or patient.get('schedule','')
-            # patient["firstName"], patient["lastName"] = fn, ln
-            # patient["schedule"] = sched
-            # print("✅ All editable fields updated successfully!")
+
+            service.update_info(patients, patient, first_name=fn, last_name=ln, contact=contact_input)
+            print("✅ All editable fields updated successfully!")
 
         elif choice == "6":
             print("\n--- Mark Patient Visit as Done ---")
 
             # Check if the patient has a schedule
-            if not patient.get("schedule"):
+            if not patient.schedule:
                 print("❌ No schedule found for this patient.")
             else:
                 today = date.today().isoformat()
-                print(f"🗓️ Current schedule: {patient['schedule']}")
+                print(f"🗓️ Current schedule: {patient.schedule}")
 
                 # Always ask first before marking as done
                 confirm = input("Do you want to mark this visit as done? (y/n): ").strip().lower()
@@ -168,18 +191,16 @@ def update_patient(patients):
                     continue  # back to update menu
 
                 # Warn if scheduled date is not today
-                if patient["schedule"] != today:
+                if patient.schedule != today:
                     confirm2 = input("⚠️ The scheduled date is not today. Still mark as done? (y/n): ").strip().lower()
                     if confirm2 != "y":
                         print("ℹ️ Visit not marked.")
                         continue  # back to update menu
 
                 # Mark as visited
-                patient["scheduleStatus"] = True
+                service.mark_visited(patients, patient)
                 print("✅ Visit marked as completed and removed from upcoming appointments.")
 
-
-
         elif choice == "7":
             print("\n--- Update Procedure / Add Payment ---")
             procedure_name = input("Enter procedure name: ").strip()
@@ -187,111 +208,41 @@ def update_patient(patients):
                 print("❌ Procedure name cannot be empty.")
                 continue
 
-            # amount input validation
-            while True:
-                payment_input = input("Enter payment amount: ₱").strip()
-                if not payment_input:
-                    print("❌ Amount cannot be empty.")
-                    continue
-                try:
-                    amount = float(payment_input)
-                    if amount < 0:
-                        print("❌ Amount cannot be negative.")
-                        continue
-                    break
-                except ValueError:
-                    print("❌ Invalid amount. Please enter a number.")
-
-            # initialize procedure list if missing
-            if not isinstance(patient.get("procedure"), list):
-                patient["procedure"] = []
-
-            # append procedure dict
-            proc_entry = {
-                "name": procedure_name,
-                "amount": amount,
-                "date": date.today().isoformat()
-            }
-            patient["procedure"].append(proc_entry)
-
-            # update balance & status
-            patient["balance"] = float(patient.get("balance", 0.0)) + amount
-            patient["status"] = "unpaid" if patient["balance"] > 0 else "paid"
-
+            _ask_amount(
+                "Enter payment amount: ₱",
+                lambda amount: service.add_procedure(patients, patient, procedure_name, amount),
+            )
             print("✅ Procedure added and recorded to history!")
 
         elif choice == "8":
             print("\n--- Settle Balance ---")
 
             # ✅ Show detailed procedure history with partial payments
-            if "procedure" in patient and patient["procedure"]:
+            if isinstance(patient.procedure, list) and patient.procedure:
                 print("\n🦷 Procedure History:")
-                for i, p in enumerate(patient["procedure"], 1):
+                for i, p in enumerate(patient.procedure, 1):
                     paid = p.get("paid", 0.0)
-                    remaining = p["amount"] - paid
-                    print(f"  {i}. {p['name']} - ₱{p['amount']} | Paid: ₱{paid} | Remaining: ₱{remaining} ({p['date']})")
+                    remaining = p.amount - paid
+                    print(f"  {i}. {p.name} - ₱{p.amount} | Paid: ₱{paid} | Remaining: ₱{remaining} ({p.date})")
             else:
                 print("No recorded procedures yet.")
 
             # ✅ Show total balance
-            total_balance = patient.get("balance", 0)
+            total_balance = patient.balance
             if total_balance <= 0:
                 print("\n✅ No balance to settle.")
             else:
                 print(f"\nCurrent total balance: ₱{total_balance}")
 
-                while True:
-                    payment_input = input("Enter payment amount: ₱").strip()
-                    if not payment_input:
-                        print("❌ Payment cannot be empty. Please enter a valid number.")
-                        continue
-                    try:
-                        payment = float(payment_input)
-                        if payment < 0:
-                            print("❌ Payment cannot be negative.")
-                            continue
-                        if payment > total_balance:
-                            print(f"❌ Payment cannot exceed the total balance of ₱{total_balance}.")
-                            continue
-                        break
-                    except ValueError:
-                        print("❌ Invalid input. Please enter a number.")
-
-                remaining_payment = payment
-
-                # ✅ Apply payment to procedures in order
-                for p in patient["procedure"]:
-                    unpaid = p["amount"] - p.get("paid", 0.0)
-                    if unpaid <= 0:
-                        continue  # already fully paid
-                    if remaining_payment >= unpaid:
-                        p["paid"] = p.get("paid", 0.0) + unpaid
-                        remaining_payment -= unpaid
-                    else:
-                        p["paid"] = p.get("paid", 0.0) + remaining_payment
-                        remaining_payment = 0
-                        break
-
-                # ✅ Recalculate balance
-                total_paid = sum(p.get("paid", 0.0) for p in patient["procedure"])
-                total_due = sum(p["amount"] for p in patient["procedure"])
-                patient["balance"] = total_due - total_paid
-
-                # ✅ Update status
-                if patient["balance"] <= 0:
-                    patient["balance"] = 0
-                    patient["status"] = "paid"
+                # ✅ Payment is applied to procedures in order by the service
+                remaining = _ask_amount(
+                    "Enter payment amount: ₱",
+                    lambda amount: service.record_payment(patients, patient, amount),
+                )
+                if remaining <= 0:
                     print("\n✅ Balance fully settled!")
                 else:
-                    patient["status"] = "unpaid"
-                    print(f"\nPartial payment accepted. Remaining balance: ₱{patient['balance']}")
-
-            # ✅ Save updates
-            patient["lastUpdated"] = date.today().isoformat()
-            save_data(patients)
-
-
-
+                    print(f"\nPartial payment accepted. Remaining balance: ₱{remaining}")
 
         elif choice == "9":
             print("💾 Changes saved. Exiting update mode...\n")
@@ -299,32 +250,76 @@ def update_patient(patients):
         else:
             print("❌ Invalid choice. Try again.")
 
-        # update timestamp and save
-        patient["lastUpdated"] = date.today().isoformat()
-        save_data(patients)
-        
+def _ask_view_options(show_active):
+    """Ask for sort order and filters; Enter skips each question."""
+    print("Sort by: " + ", ".join(f"{k} = {label}" for k, (label, _) in SORT_KEYS.items()))
+    sort = input("Sort (Enter = stored order): ").strip().lower() or None
+    if sort and sort not in SORT_KEYS:
+        print("❌ Unknown sort, using stored order.")
+        sort = None
+
+    status = input("Status (paid/unpaid, Enter = all): ").strip().lower() or None
+    if status not in (None, "paid", "unpaid"):
+        print("❌ Unknown status, showing all.")
+        status = None
+
+    def amount(prompt):
+        text = input(prompt).strip()
+        if not text:
+            return None
+        try:
+            return float(text)
+        except ValueError:
+            print("❌ Not a number, ignored.")
+            return None
+
+    min_balance = amount("Minimum balance (Enter = none): ")
+    max_balance = amount("Maximum balance (Enter = none): ")
+
+    date_field, date_from, date_to = "schedule", None, None
+    choice = input("Filter by date? 1 = next schedule, 2 = last updated, Enter = no: ").strip()
+    if choice in ("1", "2"):
+        date_field = "schedule" if choice == "1" else "lastUpdated"
+        date_from, date_to = _ask_date_range()
+    return sort, make_filter(show_active, status, min_balance, max_balance,
+                             date_field, date_from, date_to)
+
+
+def _ask_date_range():
+    date_from = input("From (YYYY-MM-DD, Enter = open): ").strip() or None
+    date_to = input("To (YYYY-MM-DD, Enter = open): ").strip() or None
+    for d in (date_from, date_to):
+        if d and not validate_date_str(d):
+            print("❌ Invalid date, date filter ignored.")
+            return None, None
+    return date_from, date_to
+
+
 def view_patients(patients, show_active=True):
+    """
+    Page through patients. `patients` is a list or a zero-argument function
+    returning a fresh iterator (e.g. data_handler.iter_archived for the archive).
+    """
     print("\n--- Patient List ---")
-    filtered = [p for p in patients if p["isActive"] == show_active]
-    if not filtered:
+    source = patients if callable(patients) else (lambda: iter(patients))
+    sort, keep = None, make_filter(show_active)
+    if input("Press Enter to list, or 'f' to sort/filter: ").strip().lower() == "f":
+        sort, keep = _ask_view_options(show_active)
+
+    pages = iter_pages(source, keep, sort)
+    page = next(pages, None)
+    if page is None:
         print("No patients found.\n")
         return
-    for p in filtered:
-        print(f"\nName: {p['firstName']} {p['lastName']}")
-        print(f"Birthday: {p['bday']}")
-        print(f"Contact: {p['contact']}")
-        print(f"Balance: ₱{p['balance']}")
-        print(f"Next Schedule: {p['schedule']}")
-        #print(f"Procedure: {p['procedure']}")
-        if isinstance(p["procedure"], list):
-            print("Procedure History:")
-            for pr in p["procedure"]:
-                print(f"  - {pr['name']} (₱{pr['amount']}) on {pr['date']}")
-        else:
-            print(f"Procedure: {p['procedure']}")
-
-        print(f"Status: {p['status']}")
-        print(f"Active: {p['isActive']}")
+    number, first_row = 1, 1
+    while True:
+        write_page(page, number, first_row)
+        following = next(pages, None)  # look ahead so the last page doesn't prompt
+        if following is None:
+            break
+        if input("Enter = next page, q = back to menu: ").strip().lower() == "q":
+            break
+        number, first_row, page = number + 1, first_row + len(page), following
     print()
 
 # def archive_patient(patients):
@@ -363,69 +358,113 @@ def archive_patient(patients):
     if not patient:
         return
 
-    archived = load_data(ARCHIVE_FILE)
-    patient["isActive"] = False
-    archived.append(patient)
+    patient.isActive = False
     patients.remove(patient)
+    unindex_patient(patients, patient)
+    unindex_schedule(patients, patient)
+    unledger_patient(patients, patient)
+    unslot_patient(patients, patient)
 
+    archive_patients([patient])
     save_data(patients)
-    save_data(archived, ARCHIVE_FILE)
-    print(f"📦 Patient '{patient['firstName']} {patient['lastName']}' archived.\n")
+    print(f"📦 Patient '{patient.firstName} {patient.lastName}' archived.\n")
 
 
 def view_balance_stats(patients):
     print("\n--- Floating Balance Stats ---")
-    found = False  # flag to track if any unpaid balance was shown
+    ledger = get_ledger(patients)
 
-    for p in patients:
-        if p.get("isActive", True) and p.get("status") == "unpaid" and p.get("balance", 0) > 0:
-            print(f"{p['firstName']} {p['lastName']}: ₱{p['balance']}")
-            found = True
+    # Ledger keeps unpaid balances sorted, largest first
+    for p, amount in ledger.largest():
+        print(f"{p.firstName} {p.lastName}: ₱{p.balance}")
 
-    if not found:
+    if not ledger.ranked:
         print("✅ No outstanding balances. All patients are fully paid!")
+    else:
+        print(f"\nTotal Outstanding: ₱{round(ledger.total, 2)} ({len(ledger.ranked)} patients)")
     print()
 
 
 
 
 
+def view_reports(patients):
+    print("\n--- Clinic Reports ---")
+    if input("Include archived patients? (y/n): ").strip().lower() == "y":
+        # one-off columns over active + archived history (the archive is streamed)
+        report = ReportColumns()
+        report.build(list(chain(patients, iter_archived())))
+    else:
+        report = get_reports(patients)
+
+    today = date.today()
+    this_month = today.year * 12 + today.month - 1
+    lines = ["\n📈 Revenue by Month (last 12 months)"]
+    months = report.revenue_by_month(first=this_month - 11, last=this_month)
+    for month, billed, collected in months:
+        lines.append(f"  {month}: billed ₱{billed:,.2f} | collected ₱{collected:,.2f}")
+    if not months:
+        lines.append("  No procedures in the last 12 months.")
+
+    for title, month in (("This Month", this_month), ("All Time", None)):
+        lines.append(f"\n🦷 Revenue by Procedure ({title})")
+        rows = report.revenue_by_procedure(month)
+        for name, billed, collected in rows:
+            lines.append(f"  {name}: billed ₱{billed:,.2f} | collected ₱{collected:,.2f}")
+        if not rows:
+            lines.append("  No procedures.")
+        rate = report.collection_rate(month)
+        if rate is not None:
+            lines.append(f"  Collection rate: {rate:.1%}")
+
+    lines.append("\n⏳ Receivables Aging (by procedure date)")
+    for label, amount, count in report.aging(today):
+        lines.append(f"  {label:>10}: ₱{amount:,.2f} ({count} procedures)")
+    print("\n".join(lines) + "\n")
+
+
+def _appointment_text(patient):
+    """'2025-10-20 09:30 (chair 2)', or just the date for bookings made before slots."""
+    slot = patient.get("scheduleSlot")
+    if not patient.schedule or not slot or "@" not in slot:
+        return patient.schedule
+    time_text, chair = slot.split("@", 1)
+    return f"{patient.schedule} {time_text} (chair {chair})"
+
+
 def view_schedule(patients):
     print("\n--- Upcoming Appointments ---")
     found = False
     today = date.today()
+    schedules = get_schedule_index(patients)
 
-    for p in patients:
-        schedule_str = p.get("schedule", "").strip()
-        if not schedule_str:
-            continue  # skip if no schedule at all
-
-        # parse schedule safely
-        try:
-            sched_date = datetime.strptime(schedule_str, "%Y-%m-%d").date()
-        except ValueError:
-            # skip invalid date formats
-            continue
-
+    # Index returns today's and future schedules in date order (already parsed)
+    for p in schedules.upcoming(today=today):
         # Only show active patients with schedule today or future.
         # If schedule is today and scheduleStatus is True (visited), skip it.
-        if not p.get("isActive", True):
-            continue
-
-        if sched_date < today:
-            # optional: you might want to show past schedules somewhere else
+        if not p.isActive:
             continue
 
-        if sched_date == today and p.get("scheduleStatus", False):
+        if p.schedule == today.isoformat() and p.scheduleStatus:
             # visited already today -> do not show
             continue
 
         # show upcoming (today or future) appointments that are not visited today
-        print(f"{p['firstName']} {p['lastName']} - Next Appointment: {p['schedule']}")
+        print(f"{p.firstName} {p.lastName} - Next Appointment: {_appointment_text(p)}")
         found = True
 
     if not found:
         print("✅ No upcoming appointments. All schedules are completed!")
+
+    free_day, free_time = slot_start(get_slot_index(patients).next_free(first_slot_from()))
+    print(f"🪑 Next free slot: {free_day.isoformat()} {free_time}")
+
+    # Past schedules that were never marked as visited
+    overdue = [p for p in schedules.overdue(today=today) if p.isActive]
+    if overdue:
+        print("\n--- Missed Appointments (not marked visited) ---")
+        for p in overdue:
+            print(f"{p.firstName} {p.lastName} - Was Scheduled: {p.schedule}")
     print()
 
 
@@ -437,12 +476,12 @@ def dashboard(patients):
 
     # Show only patients scheduled today, still active, and not yet visited
     todays_patients = [
-        f"{p['firstName']} {p['lastName']}"
-        for p in patients
-        if p.get("schedule") == today and p.get("isActive", True) and not p.get("scheduleStatus", False)
+        f"{p.firstName} {p.lastName}"
+        for p in get_schedule_index(patients).on(date.today())
+        if p.isActive and not p.scheduleStatus
     ]
 
-    unpaid_count = sum(1 for p in patients if p.get("status") == "unpaid" and p.get("isActive", True))
+    unpaid_count = get_ledger(patients).unpaid_count()
 
     print("\n===============================================")
     print(f"🦷  Today’s Date: {today}")
@@ -0,0 +1,135 @@
+# patient_pages.py
+# Paged patient listings. Pages are pulled lazily from the patient source, so
+# memory stays bounded by the page size (the archive is streamed from disk).
+# Sorted listings use keyset pagination: each page is the `size` smallest
+# (key, position) pairs after the last one shown, found with heapq.nsmallest
+# in one pass over a fresh iterator.
+import heapq
+import sys
+from datetime import date
+from itertools import islice
+
+from records import Patient
+from schedule_index import parse_schedule
+
+PAGE_SIZE = 20
+NO_DATE = date.max.toordinal() + 1  # blank/invalid dates sort last
+
+
+def _name_key(p):
+    return (p.lastName.lower(), p.firstName.lower())
+
+
+def _balance_key(p):
+    return -float(p.balance or 0)  # largest balance first
+
+
+def _date_key(field):
+    def key(p):
+        ordinal = parse_schedule(p.get(field))
+        return NO_DATE if ordinal is None else ordinal
+    return key
+
+
+SORT_KEYS = {
+    "name": ("Name (A-Z)", _name_key),
+    "balance": ("Balance (highest first)", _balance_key),
+    "schedule": ("Next schedule (soonest first)", _date_key("schedule")),
+    "updated": ("Last updated (oldest first)", _date_key("lastUpdated")),
+}
+
+
+def make_filter(show_active=True, status=None, min_balance=None, max_balance=None,
+                date_field="schedule", date_from=None, date_to=None):
+    """
+    Predicate for iter_pages. None means "don't filter on this"; date_from/date_to
+    are inclusive YYYY-MM-DD bounds on date_field ("schedule" or "lastUpdated").
+    """
+    low = parse_schedule(date_from) if date_from else None
+    high = parse_schedule(date_to) if date_to else None
+
+    def keep(p):
+        if p.isActive != show_active:
+            return False
+        if status and p.status != status:
+            return False
+        balance = float(p.balance or 0)
+        if min_balance is not None and balance < min_balance:
+            return False
+        if max_balance is not None and balance > max_balance:
+            return False
+        if low is not None or high is not None:
+            ordinal = parse_schedule(p.get(date_field))
+            if ordinal is None:
+                return False
+            if low is not None and ordinal < low:
+                return False
+            if high is not None and ordinal > high:
+                return False
+        return True
+    return keep
+
+
+def iter_pages(source, keep=None, sort=None, size=PAGE_SIZE):
+    """
+    Yield lists of at most `size` patients.
+    source: zero-argument function returning a fresh iterator over the patients
+    (only called again when sorting). sort: a SORT_KEYS name or None (stored order).
+    """
+    keep = keep or (lambda p: True)
+    if sort is None:
+        stream = (p for p in source() if keep(p))
+        while True:
+            page = list(islice(stream, size))
+            if not page:
+                return
+            yield page
+
+    key = SORT_KEYS[sort][1]
+    last = None  # (key, position) of the last patient already shown
+    while True:
+        candidates = (
+            (key(p), pos, p) for pos, p in enumerate(source())
+            if keep(p)
+        )
+        if last is not None:
+            candidates = (c for c in candidates if (c[0], c[1]) > last)
+        page = heapq.nsmallest(size, candidates)  # positions are unique, p is never compared
+        if not page:
+            return
+        last = (page[-1][0], page[-1][1])
+        yield [p for _, _, p in page]
+        if len(page) < size:
+            return
+
+
+def format_patient(p):
+    """One patient as printable text (same fields as the old listing)."""
+    lines = [
+        f"\nName: {p.firstName} {p.lastName}",
+        f"Birthday: {p.bday}",
+        f"Contact: {p.contact}",
+        f"Balance: ₱{p.balance}",
+        f"Next Schedule: {p.schedule}",
+    ]
+    if isinstance(p, Patient) and not p.procedures_loaded():
+        # summary only: listing everyone shouldn't pull every stored history into memory
+        count, total, paid = p.procedure_summary()
+        lines.append(f"Procedures: {count} (₱{total} billed, ₱{paid} paid; full history in Update Patient)")
+    elif isinstance(p.procedure, list):
+        lines.append("Procedure History:")
+        lines.extend(f"  - {pr.name} (₱{pr.amount}) on {pr.date}" for pr in p.procedure)
+    else:
+        lines.append(f"Procedure: {p.procedure}")
+    lines.append(f"Status: {p.status}")
+    lines.append(f"Active: {p.isActive}")
+    return "\n".join(lines)
+
+
+def write_page(page, number, first_row=1, out=None):
+    """Print a page with a single write."""
+    out = out or sys.stdout
+    text = "\n".join(format_patient(p) for p in page)
+    last_row = first_row + len(page) - 1
+    out.write(f"{text}\n\n--- Page {number} (patients {first_row}-{last_row}) ---\n")
+    out.flush()
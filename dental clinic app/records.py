@@ -0,0 +1,316 @@
+# records.py
+# Compact Patient/Procedure records (__slots__ instead of one dict per record).
+# Attribute names are the JSON keys, and the records also accept p["key"] /
+# p.get("key") so code written against the JSON dicts keeps working.
+_MISSING = object()
+
+
+class _Record:
+    __slots__ = ()
+    FIELDS = ()
+    DEFAULTS = ()  # (key, value) pairs every record has, filled in by from_dict
+
+    def __getitem__(self, key):
+        if key in self._fieldset:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._fieldset:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._fieldset:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._fieldset:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._fieldset:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def keys(self):
+        return list(self.to_dict())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self):
+        """Plain dict in the JSON file shape (unset optional fields are left out)."""
+        d = {}
+        for k in self.FIELDS:
+            v = getattr(self, k, _MISSING)
+            if v is not _MISSING:
+                d[k] = v
+        if self._extra:
+            d.update(self._extra)
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls.__new__(cls)
+        obj._extra = None
+        fields = cls._fieldset
+        found = 0
+        for k, v in d.items():
+            if k in fields:
+                setattr(obj, k, v)
+                found += 1
+            else:
+                if obj._extra is None:
+                    obj._extra = {}
+                obj._extra[k] = v
+        if found < len(cls.FIELDS):
+            # old/partial data (or unset optional fields): fill in what __init__ would set
+            for k, default in cls.DEFAULTS:
+                if getattr(obj, k, _MISSING) is _MISSING:
+                    setattr(obj, k, [] if default == [] else default)
+        return obj
+
+    def assign(self, other):
+        """Overwrite this record with another one's fields (the object stays the same)."""
+        for k in self.FIELDS:
+            v = getattr(other, k, _MISSING)
+            if v is not _MISSING:
+                setattr(self, k, v)
+            elif hasattr(self, k):
+                delattr(self, k)
+        self._extra = dict(other._extra) if other._extra else None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Procedure(_Record):
+    """One procedure history entry ('paid' is only set once a payment was made)."""
+    FIELDS = ("name", "amount", "date", "paid")
+    __slots__ = FIELDS + ("_extra",)
+    _fieldset = frozenset(FIELDS)
+    DEFAULTS = (("name", ""), ("amount", 0), ("date", ""))
+
+    def __init__(self, name="", amount=0, date=""):
+        self.name = name
+        self.amount = amount
+        self.date = date
+        self._extra = None
+
+
+class Patient(_Record):
+    """
+    One patient record ('lastUpdated' may be unset on old data).
+    'version' goes up on every save and is used to detect concurrent edits.
+    The procedure list may live in the history store instead (see data_handler):
+    the record then only holds its summary and where to find it, and the list
+    is fetched on first access to `procedure`.
+    """
+    FIELDS = (
+        "firstName", "lastName", "bday", "contact", "balance", "schedule",
+        "scheduleStatus", "procedure", "status", "isActive", "lastUpdated", "id", "version",
+    )
+    __slots__ = FIELDS + ("_extra", "_history")
+    _fieldset = frozenset(FIELDS)
+    DEFAULTS = (
+        ("firstName", ""), ("lastName", ""), ("bday", ""), ("contact", ""), ("balance", 0.0),
+        ("schedule", ""), ("scheduleStatus", False), ("procedure", []), ("status", "paid"),
+        ("isActive", True), ("id", ""), ("version", 0),
+    )
+    # set by data_handler: fetches the procedure lists of records whose history is stored
+    history_loader = None
+
+    def __init__(self, firstName="", lastName="", bday="", contact="", balance=0.0, schedule="",
+                 scheduleStatus=False, procedure=None, status="paid", isActive=True,
+                 lastUpdated=None, id="", version=0):
+        self.firstName = firstName
+        self.lastName = lastName
+        self.bday = bday
+        self.contact = contact
+        self.balance = balance
+        self.schedule = schedule
+        self.scheduleStatus = scheduleStatus
+        self.procedure = procedure if procedure is not None else []
+        self.status = status
+        self.isActive = isActive
+        if lastUpdated is not None:
+            self.lastUpdated = lastUpdated
+        self.id = id
+        self.version = version
+        self._extra = None
+        self._history = None
+
+    def __getattr__(self, name):
+        # only reached when the slot is unset: a stored history not fetched yet
+        if name != "procedure" or self._history is None:
+            raise AttributeError(name)
+        type(self).history_loader([self])
+        return _PROCEDURE_SLOT.__get__(self)
+
+    def procedures_loaded(self):
+        """True if the procedure list is in memory."""
+        try:
+            _PROCEDURE_SLOT.__get__(self)
+        except AttributeError:
+            return False
+        return True
+
+    def procedure_summary(self):
+        """(count, total billed, total paid) without fetching a stored history."""
+        if self._history is not None and not self.procedures_loaded():
+            return self._history[:3]
+        return summarize(self.procedure)
+
+    def history_ref(self):
+        """(generation, offset, length) of the stored history, or None if it must be (re)written."""
+        return None if self._history is None else self._history[3:]
+
+    def set_history(self, ref):
+        """Record where this patient's current procedure list was stored."""
+        self._history = summarize(self.procedure) + tuple(ref)
+
+    def drop_history(self):
+        """The procedure list may have changed: it is stored again on the next snapshot."""
+        if self._history is not None:
+            self.procedure  # fetch it before the stored copy is forgotten
+            self._history = None
+
+    def to_dict(self):
+        d = _Record.to_dict(self)
+        if isinstance(self.procedure, list):
+            d["procedure"] = [pr.to_dict() if isinstance(pr, Procedure) else pr for pr in self.procedure]
+        return d
+
+    def to_stored_dict(self):
+        """Like to_dict, but a stored history is written as its summary and location."""
+        if self._history is None:
+            return self.to_dict()
+        d = {}
+        for k in self.FIELDS:
+            if k != "procedure":
+                v = getattr(self, k, _MISSING)
+                if v is not _MISSING:
+                    d[k] = v
+        if self._extra:
+            d.update(self._extra)
+        count, total, paid, generation, offset, length = self._history
+        d["history"] = {"count": count, "total": total, "paid": paid,
+                        "file": generation, "offset": offset, "length": length}
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = _Record.from_dict.__func__(cls, d)
+        obj._history = None
+        history = obj._extra.pop("history", None) if obj._extra else None
+        if history is not None:
+            if not obj._extra:
+                obj._extra = None
+            if "procedure" not in d:
+                del obj.procedure  # filled with [] above; fetched on first access
+                obj._history = (history["count"], history["total"], history["paid"],
+                                history["file"], history["offset"], history["length"])
+        procedures = _PROCEDURE_SLOT.__get__(obj) if obj._history is None else None
+        if isinstance(procedures, list):
+            from_dict = Procedure.from_dict
+            obj.procedure = [from_dict(pr) if isinstance(pr, dict) else pr for pr in procedures]
+        return obj
+
+    def __getstate__(self):
+        # pickled snapshot cache: field values in FIELDS order plus the names
+        # left unset; a stored history is not fetched (and not pickled)
+        values = []
+        unset = []
+        for k, slot in zip(self.FIELDS, _FIELD_SLOTS):
+            try:
+                v = slot.__get__(self) if k != "procedure" or self._history is None else _MISSING
+            except AttributeError:
+                v = _MISSING
+            if v is _MISSING:
+                values.append(None)
+                unset.append(k)
+            else:
+                values.append(v)
+        return tuple(values), tuple(unset), self._extra, self._history
+
+    def __setstate__(self, state):
+        values, unset, self._extra, self._history = state
+        for slot, v in zip(_FIELD_SLOTS, values):
+            slot.__set__(self, v)
+        for k in unset:
+            delattr(self, k)
+
+    def assign(self, other):
+        """Overwrite this record with another one's fields (a stored history is not fetched)."""
+        for k in self.FIELDS:
+            if k == "procedure":
+                v = _PROCEDURE_SLOT.__get__(other) if other.procedures_loaded() else _MISSING
+            else:
+                v = getattr(other, k, _MISSING)
+            if v is not _MISSING:
+                setattr(self, k, v)
+            elif self.procedures_loaded() if k == "procedure" else hasattr(self, k):
+                delattr(self, k)
+        self._extra = dict(other._extra) if other._extra else None
+        self._history = other._history
+
+
+_PROCEDURE_SLOT = Patient.__dict__["procedure"]
+_FIELD_SLOTS = tuple(Patient.__dict__[k] for k in Patient.FIELDS)
+
+
+def summarize(procedures):
+    """(count, total billed, total paid) of a procedure list."""
+    if not isinstance(procedures, list):
+        return 0, 0.0, 0.0
+    total = paid = 0.0
+    for pr in procedures:
+        total += float(pr.get("amount", 0) or 0)
+        paid += float(pr.get("paid", 0) or 0)
+    return len(procedures), round(total, 2), round(paid, 2)
+
+
+def load_histories(patients):
+    """Fetch every stored history among `patients` in one pass (e.g. before a report)."""
+    pending = [p for p in patients if isinstance(p, Patient) and not p.procedures_loaded()
+               and p._history is not None]
+    if pending:
+        Patient.history_loader(pending)
+
+
+def to_json(obj):
+    """json.dump(default=...) hook so records serialize in the JSON file shape."""
+    if isinstance(obj, _Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_stored_json(obj):
+    """to_json for the active snapshot/journal: stored histories stay in the history store."""
+    if isinstance(obj, Patient):
+        return obj.to_stored_dict()
+    return to_json(obj)
+
+
+def to_patients(items):
+    """Convert loaded dicts to Patient records (records pass through unchanged)."""
+    return [p if isinstance(p, Patient) else Patient.from_dict(p) for p in items]
@@ -0,0 +1,270 @@
+# reminders.py
+# Headless reminder job: texts for tomorrow's appointments and for balances
+# with something unpaid for more than OVERDUE_DAYS days.
+# The sets come from the indexes: tomorrow's appointments are one bisect range
+# in the schedule index, and only patients the balance ledger lists as owing
+# have their procedure histories read to date the oldest unpaid procedure.
+# Messages are written to an outbox folder (one file each) or sent through an
+# SMTP server (e.g. a local debugging server), several at a time. Every
+# delivered message is recorded in a sent log, so running the job again the
+# same day doesn't send anything twice.
+#
+# Usage: python reminders.py [--date YYYY-MM-DD] [--outbox DIR] [--smtp HOST[:PORT]]
+#                            [--workers 8] [--dry-run]
+import argparse
+import json
+import os
+import smtplib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from email.message import EmailMessage
+
+from balance_ledger import get_ledger
+from data_handler import load_data, resource_path
+from dates import parse_ordinal
+from file_lock import locked
+from records import load_histories
+from schedule_index import get_schedule_index
+
+OVERDUE_DAYS = 60
+OUTBOX_DIR = resource_path("outbox")
+SENT_LOG = resource_path("reminders_sent.jsonl")
+CLINIC_NAME = "the dental clinic"
+SMS_GATEWAY_DOMAIN = "sms.local"  # SMTP mode mails <contact>@<domain>
+WORKERS = 8
+
+
+# ----------------- reminder sets -----------------
+
+def appointment_reminders(patients, day):
+    """Active patients booked on `day` whose visit isn't marked done."""
+    return [
+        p for p in get_schedule_index(patients).on(day)
+        if p.get("isActive", True) and not p.get("scheduleStatus", False)
+    ]
+
+
+def overdue_balances(patients, today, days=OVERDUE_DAYS):
+    """
+    [(patient, balance, oldest unpaid date)] for patients with a procedure
+    unpaid for more than `days` days, largest balance first.
+    """
+    owing = get_ledger(patients).largest()
+    load_histories([p for p, _ in owing])  # one pass over the history store
+    cutoff = today.toordinal() - days
+    overdue = []
+    for p, balance in owing:
+        oldest = None
+        for pr in p.procedure if isinstance(p.procedure, list) else ():
+            if float(pr.get("amount", 0) or 0) - float(pr.get("paid", 0) or 0) > 0.005:
+                day = parse_ordinal(pr.get("date"))
+                if day is not None and (oldest is None or day < oldest):
+                    oldest = day
+        if oldest is not None and oldest < cutoff:
+            overdue.append((p, balance, date.fromordinal(oldest)))
+    return overdue
+
+
+# ----------------- messages -----------------
+
+def _appointment_message(p, day):
+    time_text = (p.get("scheduleSlot") or "").split("@")[0]
+    at = f" at {time_text}" if time_text else ""
+    return {
+        "key": f"appointment:{p.id}:{day.isoformat()}:{time_text.replace(':', '')}",
+        "kind": "appointment",
+        "to": p.contact,
+        "subject": "Appointment reminder",
+        "body": f"Hi {p.firstName}, this is a reminder of your appointment at {CLINIC_NAME} "
+                f"tomorrow, {day.isoformat()}{at}. Please reply if you need to reschedule.",
+    }
+
+
+def _balance_message(p, balance, oldest, today):
+    # one notice per outstanding state: a payment or new charge makes a new key
+    return {
+        "key": f"balance:{p.id}:{oldest.isoformat()}:{balance:.2f}",
+        "kind": "balance",
+        "to": p.contact,
+        "subject": "Outstanding balance",
+        "body": f"Hi {p.firstName}, you have an outstanding balance of ₱{balance:,.2f} at {CLINIC_NAME}, "
+                f"unpaid since {oldest.isoformat()} ({(today - oldest).days} days). "
+                "Please settle it on your next visit.",
+    }
+
+
+def build_messages(patients, today):
+    tomorrow = today + timedelta(days=1)
+    messages = [_appointment_message(p, tomorrow) for p in appointment_reminders(patients, tomorrow)]
+    messages += [_balance_message(p, balance, oldest, today)
+                 for p, balance, oldest in overdue_balances(patients, today)]
+    return messages
+
+
+# ----------------- delivery -----------------
+
+class SentLog:
+    """Keys of delivered messages (append-only JSON lines, safe to share between threads)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = set()
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.keys.add(json.loads(line)["key"])
+                    except (ValueError, KeyError):
+                        continue  # torn last line after a crash
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def add(self, message):
+        line = json.dumps({"key": message["key"], "to": message["to"],
+                           "sent": time.strftime("%Y-%m-%d %H:%M:%S")}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.keys.add(message["key"])
+
+
+def outbox_sender(outbox_dir):
+    """Deliver by writing one text file per message (same key -> same file)."""
+    os.makedirs(outbox_dir, exist_ok=True)
+
+    def send(message):
+        name = message["key"].replace(":", "_") + ".txt"
+        tmp = os.path.join(outbox_dir, name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"To: {message['to']}\nSubject: {message['subject']}\n\n{message['body']}\n")
+        os.replace(tmp, os.path.join(outbox_dir, name))
+    return send
+
+
+def smtp_sender(host, port):
+    """Deliver through an SMTP server; each worker thread keeps its own connection."""
+    local = threading.local()
+    connections = []
+
+    def send(message):
+        if getattr(local, "smtp", None) is None:
+            local.smtp = smtplib.SMTP(host, port, timeout=30)
+            connections.append(local.smtp)
+        email = EmailMessage()
+        email["From"] = f"reminders@{SMS_GATEWAY_DOMAIN}"
+        email["To"] = f"{message['to']}@{SMS_GATEWAY_DOMAIN}"
+        email["Subject"] = message["subject"]
+        email.set_content(message["body"])
+        local.smtp.send_message(email)
+
+    def close():
+        for smtp in connections:
+            try:
+                smtp.quit()
+            except smtplib.SMTPException:
+                pass
+    send.close = close
+    return send
+
+
+def deliver(messages, send, sent_log, workers=WORKERS):
+    """
+    Send the messages not in the sent log, `workers` at a time. A message is
+    logged only after it was delivered (a crash in between resends it once).
+    Returns (sent, skipped, [(message, error)]).
+    """
+    pending = [m for m in messages if m["key"] not in sent_log]
+    failed = []
+
+    def one(message):
+        try:
+            send(message)
+        except (OSError, smtplib.SMTPException) as e:
+            return message, e
+        sent_log.add(message)
+        return message, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for message, error in pool.map(one, pending):
+            if error is not None:
+                failed.append((message, error))
+    return len(pending) - len(failed), len(messages) - len(pending), failed
+
+
+def run(patients, today, send, sent_log_path=SENT_LOG, workers=WORKERS):
+    """Build and deliver today's reminders. Returns a stats dict."""
+    start = time.perf_counter()
+    messages = build_messages(patients, today)
+    built = time.perf_counter()
+    # one job at a time: two overlapping runs could both see a message as unsent
+    with locked(sent_log_path):
+        sent, skipped, failed = deliver(messages, send, SentLog(sent_log_path), workers)
+    done = time.perf_counter()
+    return {
+        "appointments": sum(m["kind"] == "appointment" for m in messages),
+        "balances": sum(m["kind"] == "balance" for m in messages),
+        "sent": sent,
+        "skipped": skipped,
+        "failed": failed,
+        "build_seconds": built - start,
+        "send_seconds": done - built,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send appointment and overdue-balance reminders")
+    parser.add_argument("--date", help="run as if today were this date (YYYY-MM-DD)")
+    parser.add_argument("--outbox", default=OUTBOX_DIR, help="folder for message files")
+    parser.add_argument("--smtp", help="HOST[:PORT] of an SMTP server to send through instead (port 25 by default)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="only list who would get a message")
+    args = parser.parse_args()
+    if args.smtp:
+        host, sep, port = args.smtp.partition(":")
+        if sep and not (port.isdigit() and 0 < int(port) < 65536):
+            parser.error(f"--smtp: invalid port {port!r} (use HOST or HOST:PORT)")
+        smtp_host, smtp_port = host or "localhost", int(port) if sep else 25
+
+    today = date.today()
+    if args.date:
+        day = parse_ordinal(args.date)
+        if day is None:
+            print("❌ Invalid date format. Please use YYYY-MM-DD.")
+            sys.exit(1)
+        today = date.fromordinal(day)
+    patients = load_data()
+
+    if args.dry_run:
+        for m in build_messages(patients, today):
+            print(f"{m['kind']:12} {m['to']:14} {m['body']}")
+        return
+
+    if args.smtp:
+        send = smtp_sender(smtp_host, smtp_port)
+    else:
+        send = outbox_sender(args.outbox)
+    try:
+        stats = run(patients, today, send, workers=args.workers)
+    finally:
+        if hasattr(send, "close"):
+            send.close()
+
+    for message, error in stats["failed"]:
+        print(f"❌ {message['to']}: {error}")
+    rate = stats["sent"] / stats["send_seconds"] if stats["send_seconds"] else 0
+    print(f"📋 Reminders due: {stats['appointments']} appointments tomorrow, "
+          f"{stats['balances']} balances unpaid over {OVERDUE_DAYS} days "
+          f"(found in {stats['build_seconds'] * 1000:.0f} ms)")
+    print(f"✅ Sent {stats['sent']} in {stats['send_seconds']:.2f}s ({rate:,.0f}/s), "
+          f"{stats['skipped']} already sent earlier, {len(stats['failed'])} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# reports.py
+# Clinic analytics over procedure histories: revenue per procedure and per
+# month, receivables aging and collection rate.
+# Every procedure is one row in typed `array` columns (day ordinal, month,
+# amount, paid, procedure-name code). Grouped totals are computed in one
+# zip() pass over the columns when the report is built, then kept up to date
+# per patient, like the ledger: a patient's old rows are tombstoned and new
+# rows appended on each edit. Reports then only read the small group tables.
+# Building the columns is what fetches the stored procedure histories, so it
+# only happens when a report is opened, not on every commit.
+from array import array
+from datetime import date
+
+from dates import parse_ordinal
+from records import load_histories
+
+AGING_BUCKETS = ((0, 30, "0-30 days"), (31, 60, "31-60 days"), (61, 90, "61-90 days"), (91, None, "90+ days"))
+NO_MONTH = -1       # procedures without a valid date
+COMPACT_MIN_DEAD = 10_000  # tombstoned rows are dropped once there are this many (and half are dead)
+
+_months = {}  # day ordinal -> month number (year * 12 + month - 1)
+
+
+def _month_of(day):
+    if not day:
+        return NO_MONTH
+    month = _months.get(day)
+    if month is None:
+        d = date.fromordinal(day)
+        month = _months[day] = d.year * 12 + d.month - 1
+    return month
+
+
+def month_label(month):
+    return "unknown" if month == NO_MONTH else f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def month_number(label):
+    """'YYYY-MM' -> month number (ValueError if malformed)."""
+    year, month = label.split("-")
+    if not (1 <= int(month) <= 12):
+        raise ValueError(label)
+    return int(year) * 12 + int(month) - 1
+
+
+class ReportColumns:
+    """Procedure rows as columns, plus running group totals."""
+
+    def __init__(self):
+        self.source = None      # patient list these columns were built from
+        self.patients = {}      # id -> patient
+        self.rows = {}          # id -> row numbers of that patient's procedures
+        self.day = array("i")       # day ordinal (0 = no valid date)
+        self.month = array("i")     # month number (NO_MONTH = no valid date)
+        self.code = array("i")      # procedure name code
+        self.amount = array("d")
+        self.paid = array("d")
+        self.alive = array("b")     # 0 = tombstoned by a later edit
+        self.dead = 0
+        self.names = []         # code -> procedure name
+        self.codes = {}         # procedure name -> code
+        # running totals
+        self.billed = {}        # (month, code) -> amount billed
+        self.collected = {}     # (month, code) -> amount paid
+        self.unpaid = {}        # day ordinal -> outstanding amount
+        self.unpaid_rows = {}   # day ordinal -> procedures with something outstanding
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        load_histories(patients)  # stored procedure lists, one pass over the history file
+        # plain lists first, converted to arrays once
+        day, month, code, amount, paid = [], [], [], [], []
+        code_of, rows = self._code_of, self.rows
+        for p in patients:
+            pid = p.get("id")
+            self.patients[pid] = p
+            procedures = p.get("procedure")
+            if not isinstance(procedures, list):
+                rows[pid] = []
+                continue
+            start = len(amount)
+            for pr in procedures:
+                d = parse_ordinal(pr.get("date")) or 0
+                day.append(d)
+                month.append(_month_of(d))
+                code.append(code_of(pr.get("name", "")))
+                amount.append(float(pr.get("amount", 0) or 0))
+                paid.append(float(pr.get("paid", 0) or 0))
+            rows[pid] = list(range(start, len(amount)))
+        self.day, self.month, self.code = array("i", day), array("i", month), array("i", code)
+        self.amount, self.paid = array("d", amount), array("d", paid)
+        self.alive = array("b", [1]) * len(amount)
+        self.billed, self.collected, self.unpaid, self.unpaid_rows = self._aggregate()
+
+    def _code_of(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def _append_rows(self, patient):
+        pid = patient.get("id")
+        self.patients[pid] = patient
+        procedures = patient.get("procedure")
+        if not isinstance(procedures, list) or not procedures:
+            self.rows[pid] = []
+            return []
+        start = len(self.amount)
+        days = [parse_ordinal(pr.get("date")) or 0 for pr in procedures]
+        self.day.extend(days)
+        self.month.extend(_month_of(d) for d in days)
+        self.code.extend(self._code_of(pr.get("name", "")) for pr in procedures)
+        self.amount.extend(float(pr.get("amount", 0) or 0) for pr in procedures)
+        self.paid.extend(float(pr.get("paid", 0) or 0) for pr in procedures)
+        self.alive.extend([1] * len(procedures))
+        rows = self.rows[pid] = list(range(start, len(self.amount)))
+        return rows
+
+    def _aggregate(self):
+        """Group totals recomputed from the columns in one pass."""
+        billed, collected, unpaid, unpaid_rows = {}, {}, {}, {}
+        for alive, day, month, code, amount, paid in zip(
+                self.alive, self.day, self.month, self.code, self.amount, self.paid):
+            if not alive:
+                continue
+            key = (month, code)
+            billed[key] = billed.get(key, 0.0) + amount
+            collected[key] = collected.get(key, 0.0) + paid
+            if amount > paid:
+                unpaid[day] = unpaid.get(day, 0.0) + amount - paid
+                unpaid_rows[day] = unpaid_rows.get(day, 0) + 1
+        return billed, collected, unpaid, unpaid_rows
+
+    def _count(self, rows, sign):
+        for i in rows:
+            key = (self.month[i], self.code[i])
+            amount, paid, day = self.amount[i], self.paid[i], self.day[i]
+            self.billed[key] = self.billed.get(key, 0.0) + sign * amount
+            self.collected[key] = self.collected.get(key, 0.0) + sign * paid
+            if amount > paid:
+                self.unpaid[day] = self.unpaid.get(day, 0.0) + sign * (amount - paid)
+                self.unpaid_rows[day] = self.unpaid_rows.get(day, 0) + sign
+                if not self.unpaid_rows[day]:
+                    del self.unpaid_rows[day]
+                    del self.unpaid[day]  # drop float drift with the last row
+
+    def add(self, patient):
+        if patient.get("id") in self.patients:
+            self.remove(patient)
+        self._count(self._append_rows(patient), +1)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        self.patients.pop(pid, None)
+        rows = self.rows.pop(pid, [])
+        self._count(rows, -1)
+        for i in rows:
+            self.alive[i] = 0
+        self.dead += len(rows)
+        if self.dead >= COMPACT_MIN_DEAD and self.dead * 2 > len(self.alive):
+            self._compact()
+
+    def update(self, patient):
+        """Re-count a patient after a procedure or payment was recorded."""
+        self.remove(patient)
+        self.add(patient)
+
+    def _compact(self):
+        """Drop tombstoned rows (totals don't change)."""
+        keep = [i for i, alive in enumerate(self.alive) if alive]
+        new_row = {old: new for new, old in enumerate(keep)}
+        for name in ("day", "month", "code", "amount", "paid"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[i] for i in keep]))
+        self.alive = array("b", [1] * len(keep))
+        self.rows = {pid: [new_row[i] for i in rows] for pid, rows in self.rows.items()}
+        self.dead = 0
+
+    # ----------------- reports -----------------
+
+    def revenue_by_month(self, first=None, last=None):
+        """[(YYYY-MM, billed, collected)] in month order, optionally from/to a month number."""
+        months = {}
+        for (month, _), amount in self.billed.items():
+            if (first is None or month >= first) and (last is None or month <= last):
+                months.setdefault(month, [0.0, 0.0])[0] += amount
+        for (month, _), paid in self.collected.items():
+            if month in months:
+                months[month][1] += paid
+        return [(month_label(m), round(b, 2), round(c, 2)) for m, (b, c) in sorted(months.items())]
+
+    def revenue_by_procedure(self, month=None):
+        """[(procedure, billed, collected)], largest billed first (one month or all time)."""
+        totals = {}
+        for (m, code), amount in self.billed.items():
+            if month is None or m == month:
+                totals.setdefault(code, [0.0, 0.0])[0] += amount
+        for (m, code), paid in self.collected.items():
+            if code in totals and (month is None or m == month):
+                totals[code][1] += paid
+        ranked = sorted(totals.items(), key=lambda item: -item[1][0])
+        return [(self.names[code], round(b, 2), round(c, 2)) for code, (b, c) in ranked if b or c]
+
+    def aging(self, today=None):
+        """[(bucket label, outstanding amount, procedures)] by age of the unpaid procedure."""
+        today = (today or date.today()).toordinal()
+        buckets = [[label, 0.0, 0] for _, _, label in AGING_BUCKETS]
+        for day, amount in self.unpaid.items():
+            age = max(0, today - day) if day else AGING_BUCKETS[-1][0]  # undated counts as oldest
+            for i, (low, high, _) in enumerate(AGING_BUCKETS):
+                if age >= low and (high is None or age <= high):
+                    buckets[i][1] += amount
+                    buckets[i][2] += self.unpaid_rows[day]
+                    break
+        return [(label, round(amount, 2), count) for label, amount, count in buckets]
+
+    def collection_rate(self, month=None):
+        """Share of billed amounts already paid (None if nothing was billed)."""
+        billed = sum(v for (m, _), v in self.billed.items() if month is None or m == month)
+        collected = sum(v for (m, _), v in self.collected.items() if month is None or m == month)
+        return collected / billed if billed > 0.005 else None
+
+    def verify(self):
+        """Compare the running totals with a fresh pass over the columns ([] = correct)."""
+        problems = []
+        names = ("billed", "collected", "unpaid", "unpaid_rows")
+        for name, fresh in zip(names, self._aggregate()):
+            running = getattr(self, name)
+            for key in set(fresh) | set(running):
+                if abs(fresh.get(key, 0) - running.get(key, 0)) > 0.005:
+                    problems.append(f"{name}{key}: running {running.get(key, 0)} vs {fresh.get(key, 0)}")
+        return problems
+
+
+_reports = ReportColumns()
+
+
+def get_reports(patients):
+    """Return the shared report columns for this patient list, building them if needed."""
+    if _reports.source is not patients or len(_reports.patients) != len(patients):
+        _reports.build(patients)
+    return _reports
+
+
+def report_patient(patients, patient):
+    """Re-count one patient after create/update (built lazily by get_reports otherwise)."""
+    if _reports.source is patients:
+        _reports.update(patient)
+
+
+def unreport_patient(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _reports.source is patients:
+        _reports.remove(patient)
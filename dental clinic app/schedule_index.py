@@ -0,0 +1,119 @@
+# schedule_index.py
+# Date-ordered appointment index. Schedules are parsed once when a patient
+# is indexed, so "today"/"upcoming"/"overdue" are bisect range lookups.
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+
+from dates import parse_ordinal
+
+
+def parse_schedule(schedule_str):
+    """Return the date ordinal of a YYYY-MM-DD schedule, or None if blank/invalid."""
+    return parse_ordinal(schedule_str)
+
+
+class ScheduleIndex:
+    """Sorted list of (date ordinal, seq, id) for every patient with a schedule."""
+
+    def __init__(self):
+        self.source = None   # patient list this index was built from
+        self.entries = []    # sorted (ordinal, seq, id)
+        self.by_id = {}      # id -> its entry in self.entries
+        self.patients = {}   # id -> patient
+        self._seq = 0
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        for p in patients:
+            self.patients[p.get("id")] = p
+            entry = self._entry(p)
+            if entry is not None:
+                self.entries.append(entry)
+        self.entries.sort()
+
+    def _entry(self, patient):
+        ordinal = parse_schedule(patient.get("schedule"))
+        if ordinal is None:
+            return None
+        pid = patient.get("id")
+        entry = (ordinal, self._seq, pid)
+        self._seq += 1
+        self.by_id[pid] = entry
+        return entry
+
+    def add(self, patient):
+        pid = patient.get("id")
+        if pid in self.patients:
+            self.remove(patient)
+        self.patients[pid] = patient
+        entry = self._entry(patient)
+        if entry is not None:
+            insort(self.entries, entry)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        self.patients.pop(pid, None)
+        entry = self.by_id.pop(pid, None)
+        if entry is None:
+            return
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+
+    def update(self, patient):
+        """Re-index a patient after its schedule changed."""
+        self.remove(patient)
+        self.add(patient)
+
+    # ----------------- queries -----------------
+
+    def between(self, start, end):
+        """Patients scheduled from start to end (dates, both inclusive), in date order."""
+        lo = bisect_left(self.entries, (start.toordinal(),))
+        hi = bisect_left(self.entries, (end.toordinal() + 1,))
+        return [self.patients[pid] for _, _, pid in self.entries[lo:hi]]
+
+    def on(self, day):
+        return self.between(day, day)
+
+    def upcoming(self, days=None, today=None):
+        """Patients scheduled from today on (optionally only the next N days)."""
+        today = today or date.today()
+        if days is None:
+            lo = bisect_left(self.entries, (today.toordinal(),))
+            return [self.patients[pid] for _, _, pid in self.entries[lo:]]
+        return self.between(today, today + timedelta(days=days))
+
+    def overdue(self, today=None):
+        """Patients whose schedule is before today and was not marked visited."""
+        today = today or date.today()
+        hi = bisect_left(self.entries, (today.toordinal(),))
+        return [
+            self.patients[pid] for _, _, pid in self.entries[:hi]
+            if not self.patients[pid].get("scheduleStatus", False)
+        ]
+
+
+_index = ScheduleIndex()
+
+
+def get_schedule_index(patients):
+    """Return the shared schedule index for this patient list, building it if needed."""
+    if _index.source is not patients or len(_index.patients) != len(patients):
+        _index.build(patients)
+    return _index
+
+
+def index_schedule(patients, patient):
+    """Add or re-index one patient after create/update."""
+    if _index.source is patients:
+        _index.update(patient)
+    else:
+        _index.build(patients)
+
+
+def unindex_schedule(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _index.source is patients:
+        _index.remove(patient)
@@ -0,0 +1,231 @@
+# scheduler.py
+# Appointment slots with per-chair capacity. A booking is the patient's
+# schedule date plus a "scheduleSlot" reference "HH:MM@chair" (e.g. "09:30@2").
+# Slots are numbered across days (day ordinal * SLOTS_PER_DAY + slot of the
+# day), so "next free slot" is a search in a sorted list of disjoint
+# [start, end) runs of completely booked slots: one bisect, O(log N).
+# Appointments from before slots existed (date only) don't hold a chair.
+from bisect import bisect_right
+from datetime import date, datetime
+
+from dates import parse_ordinal
+
+OPEN_MINUTE = 8 * 60     # first appointment 08:00
+CLOSE_MINUTE = 18 * 60   # clinic closes 18:00
+SLOT_MINUTES = 30
+CHAIRS = 2               # appointments that can run at the same time
+SLOTS_PER_DAY = (CLOSE_MINUTE - OPEN_MINUTE) // SLOT_MINUTES
+
+
+def parse_time(text):
+    """Minute of the day for "HH:MM", or None if malformed."""
+    try:
+        hours, minutes = (text or "").strip().split(":")
+        hours, minutes = int(hours), int(minutes)
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def format_time(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def slot_key(day, minute):
+    """Global slot number for a day ordinal and start minute (None if not a slot start)."""
+    if day is None or minute is None or not (OPEN_MINUTE <= minute < CLOSE_MINUTE):
+        return None
+    if (minute - OPEN_MINUTE) % SLOT_MINUTES:
+        return None
+    return day * SLOTS_PER_DAY + (minute - OPEN_MINUTE) // SLOT_MINUTES
+
+
+def slot_start(key):
+    """(date, "HH:MM") a slot number stands for."""
+    day, index = divmod(key, SLOTS_PER_DAY)
+    return date.fromordinal(day), format_time(OPEN_MINUTE + index * SLOT_MINUTES)
+
+
+def slot_ref(minute, chair):
+    return f"{format_time(minute)}@{chair}"
+
+
+def parse_slot_ref(ref):
+    """(minute, chair) from "HH:MM@chair", or None."""
+    if not ref or "@" not in ref:
+        return None
+    time_text, chair = ref.split("@", 1)
+    minute = parse_time(time_text)
+    if minute is None or not chair.isdigit():
+        return None
+    return minute, int(chair)
+
+
+def first_slot_from(when=None):
+    """First slot that starts at or after a datetime (default: now)."""
+    when = when or datetime.now()
+    minute = when.hour * 60 + when.minute
+    day = when.date().toordinal()
+    index = max(0, -(-(minute - OPEN_MINUTE) // SLOT_MINUTES))  # round up to a slot start
+    return day * SLOTS_PER_DAY + min(index, SLOTS_PER_DAY)  # past closing -> next day's first
+
+
+class SlotIndex:
+    """Who holds which chair in which slot, plus the runs of fully booked slots."""
+
+    def __init__(self):
+        self.source = None   # patient list this index was built from
+        self.patients = {}   # id -> patient
+        self.booked = {}     # id -> (slot number, chair)
+        self.slots = {}      # slot number -> {chair: id}
+        self.full_starts = []  # sorted starts of fully booked runs
+        self.full_ends = []    # matching exclusive ends
+
+    def build(self, patients):
+        self.__init__()
+        self.source = patients
+        for p in patients:
+            self.add(p)
+
+    def _booking(self, patient):
+        ref = parse_slot_ref(patient.get("scheduleSlot"))
+        if ref is None:
+            return None
+        minute, chair = ref
+        key = slot_key(parse_ordinal(patient.get("schedule")), minute)
+        if key is None or not (1 <= chair <= CHAIRS):
+            return None
+        return key, chair
+
+    def add(self, patient):
+        pid = patient.get("id")
+        if pid in self.patients:
+            self.remove(patient)
+        self.patients[pid] = patient
+        booking = self._booking(patient)
+        if booking is None:
+            return
+        key, chair = booking
+        chairs = self.slots.setdefault(key, {})
+        if chair in chairs:
+            return  # double-booked in the data (e.g. edited elsewhere); first one keeps the chair
+        chairs[chair] = pid
+        self.booked[pid] = booking
+        if len(chairs) >= CHAIRS:
+            self._mark_full(key)
+
+    def remove(self, patient):
+        pid = patient.get("id")
+        self.patients.pop(pid, None)
+        booking = self.booked.pop(pid, None)
+        if booking is None:
+            return
+        key, chair = booking
+        chairs = self.slots[key]
+        was_full = len(chairs) >= CHAIRS
+        del chairs[chair]
+        if not chairs:
+            del self.slots[key]
+        if was_full:
+            self._unmark_full(key)
+
+    def update(self, patient):
+        """Re-book a patient after its schedule changed."""
+        self.remove(patient)
+        self.add(patient)
+
+    def _run_at(self, key):
+        """Index of the full run containing key, or -1."""
+        i = bisect_right(self.full_starts, key) - 1
+        return i if i >= 0 and self.full_ends[i] > key else -1
+
+    def _mark_full(self, key):
+        starts, ends = self.full_starts, self.full_ends
+        i = bisect_right(starts, key) - 1
+        joins_left = i >= 0 and ends[i] == key
+        joins_right = i + 1 < len(starts) and starts[i + 1] == key + 1
+        if joins_left and joins_right:
+            ends[i] = ends[i + 1]
+            del starts[i + 1], ends[i + 1]
+        elif joins_left:
+            ends[i] = key + 1
+        elif joins_right:
+            starts[i + 1] = key
+        else:
+            starts.insert(i + 1, key)
+            ends.insert(i + 1, key + 1)
+
+    def _unmark_full(self, key):
+        i = self._run_at(key)
+        if i < 0:
+            return
+        starts, ends = self.full_starts, self.full_ends
+        start, end = starts[i], ends[i]
+        if start == key and end == key + 1:
+            del starts[i], ends[i]
+        elif start == key:
+            starts[i] = key + 1
+        elif end == key + 1:
+            ends[i] = key
+        else:
+            ends[i] = key
+            starts.insert(i + 1, key + 1)
+            ends.insert(i + 1, end)
+
+    # ----------------- queries -----------------
+
+    def is_full(self, key):
+        return self._run_at(key) >= 0
+
+    def next_free(self, key):
+        """First slot number >= key with a free chair."""
+        i = self._run_at(key)
+        return key if i < 0 else self.full_ends[i]
+
+    def free_chair(self, key, patient=None):
+        """Lowest free chair in a slot (the patient's own booking counts as free), or None."""
+        chairs = self.slots.get(key, {})
+        own = self.booked.get(patient.get("id")) if patient is not None else None
+        for chair in range(1, CHAIRS + 1):
+            if chair not in chairs or own == (key, chair):
+                return chair
+        return None
+
+    def conflicts(self, key):
+        """Patients already booked in a slot, by chair."""
+        return {chair: self.patients[pid] for chair, pid in sorted(self.slots.get(key, {}).items())}
+
+    def day(self, day):
+        """[(slot number, chair, patient)] booked on a day ordinal, in time order."""
+        first = day * SLOTS_PER_DAY
+        return [
+            (key, chair, self.patients[pid])
+            for key in range(first, first + SLOTS_PER_DAY)
+            for chair, pid in sorted(self.slots.get(key, {}).items())
+        ]
+
+
+_index = SlotIndex()
+
+
+def get_slot_index(patients):
+    """Return the shared slot index for this patient list, building it if needed."""
+    if _index.source is not patients or len(_index.patients) != len(patients):
+        _index.build(patients)
+    return _index
+
+
+def slot_patient(patients, patient):
+    """Add or re-book one patient after create/update."""
+    if _index.source is patients:
+        _index.update(patient)
+    else:
+        _index.build(patients)
+
+
+def unslot_patient(patients, patient):
+    """Drop a patient that was removed from the list."""
+    if _index.source is patients:
+        _index.remove(patient)
@@ -0,0 +1,49 @@
+# snapshot_cache.py
+# Binary copy of the active snapshot for fast startup: the Patient records
+# pickled (protocol 5) next to the JSON file, tagged with the snapshot's
+# identity (inode, mtime, size). Unpickling the records skips both the JSON
+# parse and the dict -> record conversion. The JSON file stays the source of
+# truth: a cache whose tag doesn't match, or that can't be read, is ignored
+# and rebuilt from the JSON the next time it is parsed.
+import os
+import pickle
+
+CACHE_FORMAT = 1  # bump when the pickled record layout changes
+
+
+def cache_path(snapshot_file):
+    return f"{snapshot_file}.cache"
+
+
+def read_cache(snapshot_file, signature):
+    """Cached records for this snapshot version, or None."""
+    if signature is None:
+        return None
+    try:
+        with open(cache_path(snapshot_file), "rb") as f:
+            if pickle.load(f) != (CACHE_FORMAT, signature):
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:  # torn/old/foreign cache file: parse the JSON instead
+        return None
+
+
+def write_cache(snapshot_file, signature, patients):
+    """Store records for this snapshot version (best effort: the cache is disposable)."""
+    if signature is None:
+        return
+    path = cache_path(snapshot_file)
+    tmp = f"{path}.{os.getpid()}.tmp"  # readers may rebuild it at the same time
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((CACHE_FORMAT, signature), f, protocol=5)
+            pickle.dump(patients, f, protocol=5)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
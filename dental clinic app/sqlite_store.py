@@ -0,0 +1,266 @@
+# sqlite_store.py
+# SQLite storage backend for the dental clinic app (standard-library sqlite3).
+# data_handler uses it instead of the JSON files when DENTAL_STORAGE=sqlite.
+# Run "python sqlite_store.py" once to import the existing JSON files.
+import json
+import sqlite3
+import sys
+
+from dates import parse_ordinal
+
+PATIENT_COLUMNS = [
+    "id", "firstName", "lastName", "bday", "contact", "balance", "schedule",
+    "scheduleStatus", "status", "isActive", "lastUpdated",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    id              TEXT PRIMARY KEY,
+    firstName       TEXT NOT NULL DEFAULT '',
+    lastName        TEXT NOT NULL DEFAULT '',
+    bday            TEXT NOT NULL DEFAULT '',
+    contact         TEXT NOT NULL DEFAULT '',
+    balance         NUMERIC NOT NULL DEFAULT 0,
+    schedule        TEXT NOT NULL DEFAULT '',
+    scheduleStatus  INTEGER NOT NULL DEFAULT 0,
+    status          TEXT NOT NULL DEFAULT 'paid',
+    isActive        INTEGER NOT NULL DEFAULT 1,
+    lastUpdated     TEXT,
+    extra           TEXT          -- any other keys, as JSON
+);
+CREATE TABLE IF NOT EXISTS procedures (
+    patient_id  TEXT NOT NULL REFERENCES patients(id) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    name        TEXT NOT NULL DEFAULT '',
+    amount      NUMERIC NOT NULL DEFAULT 0,
+    date        TEXT NOT NULL DEFAULT '',
+    paid        NUMERIC,
+    PRIMARY KEY (patient_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_patients_name ON patients(lastName, firstName);
+CREATE INDEX IF NOT EXISTS idx_patients_schedule ON patients(schedule);
+CREATE INDEX IF NOT EXISTS idx_patients_status ON patients(isActive, status);
+CREATE INDEX IF NOT EXISTS idx_patients_last_updated ON patients(isActive, lastUpdated);
+"""
+
+# One open connection per database file for the whole session
+_connections = {}
+
+
+def connect(db_file):
+    """Open (or reuse) a WAL-mode connection and make sure the tables exist."""
+    conn = _connections.get(db_file)
+    if conn is None:
+        conn = sqlite3.connect(db_file)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        # the JSON backend's date parsing, so both compare old/unpadded dates alike
+        conn.create_function("day_ordinal", 1, parse_ordinal, deterministic=True)
+        _connections[db_file] = conn
+    return conn
+
+
+def _patient_row(patient):
+    extra = {k: v for k, v in patient.items() if k not in PATIENT_COLUMNS and k != "procedure"}
+    return (
+        patient["id"],
+        patient.get("firstName", ""),
+        patient.get("lastName", ""),
+        patient.get("bday", ""),
+        patient.get("contact", ""),
+        patient.get("balance", 0) or 0,
+        patient.get("schedule", "") or "",
+        int(bool(patient.get("scheduleStatus", False))),
+        patient.get("status", "paid"),
+        int(bool(patient.get("isActive", True))),
+        patient.get("lastUpdated"),
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+    )
+
+
+def _procedure_rows(patient):
+    procedures = patient.get("procedure")
+    if not isinstance(procedures, list):
+        return []
+    return [
+        (patient["id"], seq, pr.get("name", ""), pr.get("amount", 0), pr.get("date", ""), pr.get("paid"))
+        for seq, pr in enumerate(procedures)
+    ]
+
+
+def _write_patients(conn, patients):
+    conn.executemany(
+        f"INSERT INTO patients ({', '.join(PATIENT_COLUMNS)}, extra) "
+        f"VALUES ({', '.join('?' * (len(PATIENT_COLUMNS) + 1))}) "
+        "ON CONFLICT(id) DO UPDATE SET "
+        + ", ".join(f"{c} = excluded.{c}" for c in PATIENT_COLUMNS[1:] + ["extra"]),
+        [_patient_row(p) for p in patients],
+    )
+    # only the procedure rows of these patients are replaced
+    conn.executemany("DELETE FROM procedures WHERE patient_id = ?", [(p["id"],) for p in patients])
+    conn.executemany(
+        "INSERT INTO procedures (patient_id, seq, name, amount, date, paid) VALUES (?, ?, ?, ?, ?, ?)",
+        [row for p in patients for row in _procedure_rows(p)],
+    )
+
+
+def upsert_patients(db_file, patients, removed_ids=(), expected=None):
+    """
+    Insert or update patient rows (and their procedure rows) and delete
+    removed_ids, in one transaction. With `expected` ({id: version}), the
+    stored versions are checked first; if any differ nothing is written and
+    the ids that differ are returned.
+    """
+    conn = connect(db_file)
+    with conn:
+        if expected:
+            conn.execute("BEGIN IMMEDIATE")  # hold the write lock from the check to the write
+            stale = _stale_versions(conn, expected)
+            if stale:
+                return stale
+        _write_patients(conn, patients)
+        delete_patients(db_file, removed_ids, conn)
+    return []
+
+
+def _stale_versions(conn, expected):
+    """Ids whose stored version is not the expected one (new patients are never stale)."""
+    stale = []
+    ids = list(expected)
+    for i in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+        chunk = ids[i:i + 500]
+        for pid, version in conn.execute(
+            "SELECT id, COALESCE(json_extract(extra, '$.version'), 0) FROM patients "
+            f"WHERE id IN ({', '.join('?' * len(chunk))})",
+            chunk,
+        ):
+            if version != expected[pid]:
+                stale.append(pid)
+    return stale
+
+
+def delete_patients(db_file, ids, conn=None):
+    """Delete patients (and their procedure rows) by id."""
+    if not ids:
+        return
+    if conn is None:
+        conn = connect(db_file)
+        with conn:
+            delete_patients(db_file, ids, conn)
+        return
+    conn.executemany("DELETE FROM procedures WHERE patient_id = ?", [(pid,) for pid in ids])
+    conn.executemany("DELETE FROM patients WHERE id = ?", [(pid,) for pid in ids])
+
+
+def load_patients(db_file, active=True):
+    """Return active (or archived) patients in the same dict shape as the JSON files."""
+    conn = connect(db_file)
+    rows = conn.execute(
+        f"SELECT {', '.join(PATIENT_COLUMNS)}, extra FROM patients WHERE isActive = ? ORDER BY rowid",
+        (int(active),),
+    ).fetchall()
+
+    procedures = {}
+    for pid, name, amount, day, paid in conn.execute(
+        "SELECT pr.patient_id, pr.name, pr.amount, pr.date, pr.paid FROM procedures pr "
+        "JOIN patients p ON p.id = pr.patient_id WHERE p.isActive = ? ORDER BY pr.patient_id, pr.seq",
+        (int(active),),
+    ):
+        entry = {"name": name, "amount": amount, "date": day}
+        if paid is not None:
+            entry["paid"] = paid
+        procedures.setdefault(pid, []).append(entry)
+
+    patients = []
+    for row in rows:
+        p = dict(zip(PATIENT_COLUMNS, row[:-1]))
+        p["scheduleStatus"] = bool(p["scheduleStatus"])
+        p["isActive"] = bool(p["isActive"])
+        if p["lastUpdated"] is None:
+            del p["lastUpdated"]
+        p["procedure"] = procedures.get(p["id"], [])
+        if row[-1]:
+            p.update(json.loads(row[-1]))
+        patients.append(p)
+    return patients
+
+
+def replace_patients(db_file, patients, active=True):
+    """Make the given list the full set of active (or archived) patients."""
+    conn = connect(db_file)
+    with conn:
+        keep = {p["id"] for p in patients}
+        stale = [
+            (pid,) for (pid,) in conn.execute("SELECT id FROM patients WHERE isActive = ?", (int(active),))
+            if pid not in keep
+        ]
+        conn.executemany("DELETE FROM patients WHERE id = ?", stale)
+        if not active:
+            for p in patients:
+                p["isActive"] = False
+        _write_patients(conn, patients)
+
+
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*"
+
+
+def archive_before(db_file, cutoff):
+    """
+    Archive active patients last updated before cutoff (YYYY-MM-DD), with the
+    same date parsing as the JSON backend's sweep. Returns how many patients
+    were archived.
+    """
+    cutoff_day = parse_ordinal(cutoff)
+    conn = connect(db_file)
+    with conn:
+        # zero-padded dates: the (isActive, lastUpdated) index finds the candidates
+        cur = conn.execute(
+            "UPDATE patients SET isActive = 0 WHERE isActive = 1 AND lastUpdated < ? "
+            "AND lastUpdated GLOB ? AND day_ordinal(lastUpdated) < ?",
+            (cutoff, ISO_DATE_GLOB, cutoff_day),
+        )
+        archived = cur.rowcount
+        # old records ("2025-3-7"): can't be compared as strings, so each one is parsed
+        cur = conn.execute(
+            "UPDATE patients SET isActive = 0 WHERE isActive = 1 AND lastUpdated NOT GLOB ? "
+            "AND day_ordinal(lastUpdated) < ?",
+            (ISO_DATE_GLOB, cutoff_day),
+        )
+    return archived + cur.rowcount
+
+
+def checkpoint(db_file):
+    """Fold the WAL file back into the database (on exit)."""
+    connect(db_file).execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def migrate_from_json(db_file, active_file, archive_file, archive_dir=None):
+    """One-shot import of the JSON patient files. Returns (active, archived) counts."""
+    # load_json also replays any journal left by the JSON backend
+    from data_handler import load_json
+    from records import load_histories
+    import archive_store
+
+    counts = []
+    for file, active in ((active_file, True), (archive_file, False)):
+        patients = load_json(file)
+        load_histories(patients)  # stored procedure lists, in one pass
+        if not active and archive_dir:
+            patients.extend(archive_store.iter_archived(archive_dir))
+        for p in patients:
+            p["isActive"] = active and p.get("isActive", True)
+        conn = connect(db_file)
+        with conn:
+            _write_patients(conn, patients)
+        counts.append(len(patients))
+    return tuple(counts)
+
+
+if __name__ == "__main__":
+    from data_handler import ACTIVE_FILE, ARCHIVE_FILE, ARCHIVE_DIR, DB_FILE
+    db = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
+    active_count, archived_count = migrate_from_json(db, ACTIVE_FILE, ARCHIVE_FILE, ARCHIVE_DIR)
+    print(f"✅ Imported {active_count} active and {archived_count} archived patients into {db}")
+    print("Set DENTAL_STORAGE=sqlite to run the app on the database.")
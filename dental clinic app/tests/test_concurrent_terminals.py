@@ -0,0 +1,68 @@
+# test_concurrent_terminals.py
+# Regression tests for several terminals sharing one data folder. Each
+# "terminal" is a separate Python process started in the test's folder
+# (the data file paths are fixed when data_handler is imported).
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def script(code):
+    """Source of a terminal running `code` with the app modules importable."""
+    return f"import sys\nsys.path.insert(0, {APP_DIR!r})\n" + textwrap.dedent(code)
+
+
+def terminal(folder, code):
+    """Run `code` as a terminal in `folder`; returns what it printed last (JSON)."""
+    proc = subprocess.run([sys.executable, "-c", script(code)], cwd=folder, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    lines = proc.stdout.strip().splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def test_commit_to_a_patient_merged_away_elsewhere_conflicts(tmp_path):
+    terminal(tmp_path, """
+        import clinic_service as service, data_handler
+        patients = data_handler.load_data()
+        service.create_patient(patients, "Maria", "Santos", "1990-05-01", "09171234567")
+        service.create_patient(patients, "Juan", "Santos", "1990-05-01", "09181234567")
+    """)
+
+    # terminal B merges Juan into Maria and compacts the journal, so terminal A
+    # (which has Juan open) only notices through the rewritten snapshot
+    (tmp_path / "merge_terminal.py").write_text(script("""
+        import clinic_service as service, data_handler
+        patients = data_handler.load_data()
+        maria = next(p for p in patients if p.firstName == "Maria")
+        juan = next(p for p in patients if p.firstName == "Juan")
+        service.merge_patients(patients, maria, juan)
+        data_handler.compact_journal()
+    """))
+    result = terminal(tmp_path, """
+        import json, subprocess
+        import clinic_service as service, data_handler
+
+        patients = data_handler.load_data()
+        juan = next(p for p in patients if p.firstName == "Juan")
+        subprocess.run([sys.executable, "merge_terminal.py"], check=True)
+        try:
+            service.add_procedure(patients, juan, "Cleaning", 500, "2026-10-17")
+            outcome = "saved"
+        except data_handler.ConflictError:
+            outcome = "conflict"
+        # a patient created now was never saved: that commit must still go through
+        service.create_patient(patients, "Ana", "Reyes", "", "09191234567")
+        print(json.dumps({"outcome": outcome, "resident": sorted(p.firstName for p in patients)}))
+    """)
+    assert result["outcome"] == "conflict"
+    assert result["resident"] == ["Ana", "Maria"]
+
+    on_disk = terminal(tmp_path, """
+        import json, data_handler
+        print(json.dumps(sorted(p.firstName for p in data_handler.load_data())))
+    """)
+    assert on_disk == ["Ana", "Maria"]
@@ -1,28 +1,28 @@
 # validation.py
-from datetime import datetime
+from dates import is_valid_date
+
+def contact_error(contact):
+    """Return what is wrong with a contact number, or None if it is valid."""
+    if not contact:
+        return "Contact cannot be empty."
+    if not contact.isdigit():
+        return "Contact number must contain only digits."
+    if len(contact) != 11:
+        return "Contact number must be exactly 11 digits."
+    if not contact.startswith("09"):
+        return "Contact number must start with '09'."
+    return None
 
 def validate_contact():
     """Validate contact number format. Loops until valid."""
     while True:
         contact = input("Enter contact number (11 digits, starts with 09): ").strip()
-        if not contact:
-            print("❌ Contact cannot be empty.")
-            continue
-        if not contact.isdigit():
-            print("❌ Contact number must contain only digits.")
-        elif len(contact) != 11:
-            print("❌ Contact number must be exactly 11 digits.")
-        elif not contact.startswith("09"):
-            print("❌ Contact number must start with '09'.")
+        error = contact_error(contact)
+        if error:
+            print(f"❌ {error}")
         else:
             return contact
 
 def validate_date_str(d):
     """Return True if d is YYYY-MM-DD, False otherwise."""
-    if not d:
-        return False
-    try:
-        datetime.strptime(d, "%Y-%m-%d")
-        return True
-    except ValueError:
-        return False
+    return is_valid_date(d)